@@ -16,7 +16,7 @@ bl_info = {
 }
 
 # Required packages
-required_packages = ["numpy", "opencv-python", "scikit-image"]
+required_packages = ["numpy", "opencv-python"]
 
 def check_dependencies():
     """Check if all required packages are installed"""
@@ -4,6 +4,11 @@ Import operators for RC Metrics Add-on.
 
 import bpy
 import os
+try:
+    import imagesize
+    HAS_IMAGESIZE = True
+except ImportError:
+    HAS_IMAGESIZE = False
 
 class RCMETRICS_OT_ImportRC(bpy.types.Operator):
     """Import RealityCapture results and setup cameras"""
@@ -13,25 +18,44 @@ class RCMETRICS_OT_ImportRC(bpy.types.Operator):
     
     def check_rc_folder_structure(self, folder_path):
         """Check if the folder has the expected RealityCapture structure"""
-        # Check if the folder exists
-        if not os.path.exists(folder_path):
+        # Classify the folder contents in a single directory read (which also
+        # tells us whether the folder exists)
+        abc_files = []
+        png_files = []
+        texture_files = []
+        try:
+            entries = os.scandir(folder_path)
+        except FileNotFoundError:
             self.report({'ERROR'}, f"Folder does not exist: {folder_path}")
             return False
-            
+        except OSError as e:
+            # Not a directory, permission denied, ...
+            self.report({'ERROR'}, f"Cannot read folder: {folder_path} ({e.strerror})")
+            return False
+        with entries:
+            for entry in entries:
+                name = entry.name
+                # The file type comes from the directory listing itself, no extra stat
+                if not entry.is_file(follow_symlinks=False):
+                    continue
+                if name.endswith('.abc'):
+                    abc_files.append(name)
+                elif name.endswith('_diffuse.png'):
+                    texture_files.append(name)
+                elif name.endswith('.png'):
+                    png_files.append(name)
+        
         # Check for .abc file
-        abc_files = [f for f in os.listdir(folder_path) if f.endswith('.abc')]
         if not abc_files:
             self.report({'ERROR'}, "No .abc file found in the folder")
             return False
             
         # Check for image files (should be at least a few)
-        png_files = [f for f in os.listdir(folder_path) if f.endswith('.png') and not f.endswith('_diffuse.png')]
         if len(png_files) < 2:
             self.report({'ERROR'}, "Not enough image files found in the folder")
             return False
             
         # Check for texture file
-        texture_files = [f for f in os.listdir(folder_path) if f.endswith('_diffuse.png')]
         if not texture_files:
             self.report({'WARNING'}, "No texture file found, but proceeding anyway")
             
@@ -48,53 +72,64 @@ class RCMETRICS_OT_ImportRC(bpy.types.Operator):
         
     def setup_cameras(self, folder_path, png_files):
         """Setup the virtual cameras with correct resolution and background"""
-        # Import needed modules here to avoid issues if not installed
-        import cv2
-        
         # Get the first image to determine resolution
         first_img_path = os.path.join(folder_path, png_files[0])
         try:
-            img = cv2.imread(first_img_path)
-            if img is None:
-                self.report({'ERROR'}, f"Could not read image: {first_img_path}")
-                return False
+            if HAS_IMAGESIZE:
+                # Reads only the image header instead of decoding the whole file
+                width, height = imagesize.get(first_img_path)
+                if width < 0 or height < 0:
+                    self.report({'ERROR'}, f"Could not read image: {first_img_path}")
+                    return False
+            else:
+                # Import needed modules here to avoid issues if not installed
+                import cv2
                 
-            height, width, _ = img.shape
+                img = cv2.imread(first_img_path)
+                if img is None:
+                    self.report({'ERROR'}, f"Could not read image: {first_img_path}")
+                    return False
+                    
+                height, width, _ = img.shape
         except Exception as e:
             self.report({'ERROR'}, f"Error reading image: {e}")
             return False
         
-        # Process all cameras
-        for cam_obj in bpy.data.objects:
-            if cam_obj.type == 'CAMERA':
-                # Check if this camera corresponds to one of our image files
-                cam_name = cam_obj.name
-                if cam_name in png_files:
-                    # Set camera resolution
-                    scene = bpy.context.scene
-                    scene.render.resolution_x = width
-                    scene.render.resolution_y = height
-                    
-                    # Load the image
-                    img_path = os.path.join(folder_path, cam_name)
-                    try:
-                        img = bpy.data.images.load(img_path, check_existing=True)
-                    except:
-                        self.report({'WARNING'}, f"Could not load image: {img_path}")
-                        continue
-                    
-                    # Set up background image for the camera
-                    cam_data = cam_obj.data
-                    cam_data.show_background_images = True
-                    
-                    # Remove any existing background images
-                    for bg in cam_data.background_images:
-                        cam_data.background_images.remove(bg)
-                    
-                    # Add new background image
-                    bg = cam_data.background_images.new()
-                    bg.image = img
-                    bg.alpha = 1.0
+        # Cameras are named after their image files, so look each one up by name
+        # instead of scanning every object in the file
+        cameras = []
+        for cam_name in sorted(set(png_files)):
+            cam_obj = bpy.data.objects.get(cam_name)
+            if cam_obj is not None and cam_obj.type == 'CAMERA':
+                cameras.append(cam_obj)
+        
+        if cameras:
+            # Set camera resolution
+            scene = bpy.context.scene
+            scene.render.resolution_x = width
+            scene.render.resolution_y = height
+        
+        for cam_obj in cameras:
+            # Load the image
+            img_path = os.path.join(folder_path, cam_obj.name)
+            try:
+                img = bpy.data.images.load(img_path, check_existing=True)
+            except:
+                self.report({'WARNING'}, f"Could not load image: {img_path}")
+                continue
+            
+            # Set up background image for the camera
+            cam_data = cam_obj.data
+            cam_data.show_background_images = True
+            
+            # Remove any existing background images
+            for bg in cam_data.background_images:
+                cam_data.background_images.remove(bg)
+            
+            # Add new background image
+            bg = cam_data.background_images.new()
+            bg.image = img
+            bg.alpha = 1.0
         
         return True
     
@@ -4,15 +4,527 @@ Render operators for RC Metrics Add-on.
 
 import bpy
 import os
+import math
+import shutil
+import traceback
 import numpy as np
 import tempfile
+import importlib.util
 from bpy_extras.image_utils import load_image
 import csv
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+try:
+    import cv2
+    HAS_DEPENDENCIES = True
+except ImportError:
+    HAS_DEPENDENCIES = False
 try:
     import pandas as pd
     HAS_PANDAS = True
 except ImportError:
     HAS_PANDAS = False
+try:
+    from PIL import Image
+    HAS_PIL = True
+except ImportError:
+    HAS_PIL = False
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+try:
+    import cupy as cp
+    from cucim.skimage.metrics import structural_similarity as gpu_ssim
+    HAS_GPU_SSIM = cp.cuda.is_available()
+except ImportError:
+    HAS_GPU_SSIM = False
+# torch is slow to import, so only check that torchmetrics is installed here;
+# it is imported (and CUDA probed) the first time a large SSIM needs it
+HAS_TORCH_SSIM = importlib.util.find_spec('torchmetrics') is not None
+_torch_ssim = None
+try:
+    from turbojpeg import TurboJPEG, TJPF_RGB
+    _turbo_jpeg = TurboJPEG()
+    HAS_TURBOJPEG = True
+except (ImportError, RuntimeError, OSError):
+    # Module missing, or libjpeg-turbo itself could not be loaded
+    HAS_TURBOJPEG = False
+
+DEPENDENCY_ERROR = "Cannot import OpenCV (cv2). Please install the required dependencies."
+
+# Decoded + resized background images, keyed by (path, mtime, target shape).
+# Each entry holds [rgb, gray]; the grayscale copy is filled in on first use.
+_original_cache = OrderedDict()
+ORIGINAL_CACHE_SIZE = 4
+
+# create_diff_image work buffers, keyed by render (height, width)
+_diff_buffers = {}
+
+# (image pointer, size, RGBA uint8 array) of the last render uploaded to RC_Current_Render
+_render_pixels = None
+
+# float32 target for Image.pixels.foreach_get, reused while the image size is unchanged
+_pixel_buffer = None
+
+# Uniform-window SSIM settings for fast mode. The box filter is much cheaper than
+# Gaussian weighting and differs from Gaussian SSIM by roughly 1%.
+SSIM_FAST_KWARGS = {'gaussian_weights': False, 'win_size': 11, 'use_sample_covariance': False}
+
+# ssim_cv2 arguments reproducing skimage's default SSIM (uniform 7x7 window,
+# sample covariance), used by the color and weighted modes
+SSIM_DEFAULT_CV2_KWARGS = {'fast': True, 'win_size': 7, 'sample_covariance': True}
+
+# Renders above this many pixels use the CUDA SSIM when cuCIM is available
+GPU_SSIM_MIN_PIXELS = 1024 * 1024
+
+# Long-edge size SSIM input is reduced to for dense edge masks
+SSIM_MAX_SIZE = 512
+
+# Long-edge size SSIM input is reduced to with the 'Fit' SSIM resolution
+SSIM_FIT_SIZE = 1024
+
+# Tile edge length for the OpenCV SSIM on large images
+SSIM_TILE_SIZE = 512
+
+# Worker threads for the SSIM tiles (see get_tile_executor)
+_tile_executor = None
+
+# 1D SSIM window weights for the Numba edge-metrics kernel (used as an outer product)
+SSIM_GAUSSIAN_WINDOW = cv2.getGaussianKernel(11, 1.5).ravel() if HAS_DEPENDENCIES else None
+SSIM_FAST_WINDOW = np.full(11, 1.0 / 11.0)
+
+def write_pixels_to_image(name, rgba_array):
+    """Write an RGBA uint8 array into a generated Blender image, creating or resizing it as needed"""
+    height, width = rgba_array.shape[:2]
+    image = bpy.data.images.get(name)
+    
+    # File-backed images would be reverted on reload, so replace them with a generated one
+    if image and image.source != 'GENERATED':
+        bpy.data.images.remove(image)
+        image = None
+    
+    if image is None:
+        image = bpy.data.images.new(name, width, height, alpha=True)
+    elif tuple(image.size) != (width, height):
+        image.scale(width, height)
+    
+    # Blender stores pixels bottom-up as normalized floats
+    pixels = rgba_array[::-1].astype(np.float32).ravel()
+    pixels *= 1.0 / 255.0
+    image.pixels.foreach_set(pixels)
+    image.update()
+    return image
+
+def get_diff_buffers(shape):
+    """Reusable work buffers for create_diff_image, kept for the last render size only"""
+    key = tuple(shape)
+    bufs = _diff_buffers.get(key)
+    if bufs is None:
+        _diff_buffers.clear()
+        height, width = key
+        bufs = {
+            'rgb': np.empty((height, width, 3), dtype=np.uint8),
+            'diff': np.empty((height, width, 4), dtype=np.uint8),
+            'vis': np.empty((height, width, 4), dtype=np.uint8),
+        }
+        _diff_buffers[key] = bufs
+    return bufs
+
+def get_pixel_buffer(count):
+    """Flat float32 buffer of count values for foreach_get, reallocated only on size change"""
+    global _pixel_buffer
+    if _pixel_buffer is None or _pixel_buffer.size != count:
+        _pixel_buffer = np.empty(count, dtype=np.float32)
+    return _pixel_buffer
+
+def compute_abs_diff(render_array, original_img):
+    """Per-pixel absolute RGB difference, written into the shared diff work buffer"""
+    bufs = get_diff_buffers(render_array.shape[:2])
+    return cv2.absdiff(render_array[:,:,:3], original_img[:,:,:3], dst=bufs['rgb'])
+
+def _original_cache_entry(path, target_shape):
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        # Missing or unreadable file: callers report it as a failed load
+        return None
+    key = (path, mtime, tuple(target_shape))
+    entry = _original_cache.get(key)
+    if entry is not None:
+        _original_cache.move_to_end(key)
+        return entry
+    
+    original_img = read_image_rgb(path)
+    if original_img is None:
+        return None
+    source_shape = original_img.shape[:2]
+    
+    # 크기가 다르면 원본 이미지 리사이즈
+    if original_img.shape[:2] != tuple(target_shape):
+        original_img = cv2.resize(original_img, (target_shape[1], target_shape[0]),
+                                  interpolation=cv2.INTER_AREA)
+    
+    # Shared between compares, so guard against in-place modification
+    original_img.flags.writeable = False
+    entry = [original_img, None, source_shape]
+    _original_cache[key] = entry
+    if len(_original_cache) > ORIGINAL_CACHE_SIZE:
+        _original_cache.popitem(last=False)
+    return entry
+
+def load_original_image(path, target_shape):
+    """Load the original image resized to target_shape (height, width), reusing cached results"""
+    entry = _original_cache_entry(path, target_shape)
+    return entry[0] if entry is not None else None
+
+def original_aspect_matches(path, target_shape, tolerance=0.01):
+    """Whether the original file has the aspect ratio of target_shape, so resizing does not stretch it"""
+    entry = _original_cache_entry(path, target_shape)
+    if entry is None:
+        return True
+    src_height, src_width = entry[2]
+    height, width = target_shape[:2]
+    return abs(src_width * height - src_height * width) <= tolerance * src_height * width
+
+def load_original_gray(path, target_shape):
+    """Grayscale version of load_original_image, converted once per cached image"""
+    entry = _original_cache_entry(path, target_shape)
+    if entry is None:
+        return None
+    if entry[1] is None:
+        gray = cv2.cvtColor(entry[0], cv2.COLOR_RGB2GRAY)
+        gray.flags.writeable = False
+        entry[1] = gray
+    return entry[1]
+
+def jpeg_exif_orientation(data):
+    """EXIF Orientation tag of JPEG file bytes (1 when absent or unreadable)"""
+    if data[:2] != b'\xff\xd8':
+        return 1
+    pos = 2
+    while pos + 4 <= len(data) and data[pos] == 0xFF:
+        marker = data[pos + 1]
+        if marker in (0xD9, 0xDA):
+            # End of image / start of scan: no metadata segments follow
+            return 1
+        length = int.from_bytes(data[pos + 2:pos + 4], 'big')
+        if marker == 0xE1 and data[pos + 4:pos + 10] == b'Exif\x00\x00':
+            tiff = pos + 10
+            order = 'little' if data[tiff:tiff + 2] == b'II' else 'big'
+            ifd = tiff + int.from_bytes(data[tiff + 4:tiff + 8], order)
+            for entry in range(ifd + 2, ifd + 2 + 12 * int.from_bytes(data[ifd:ifd + 2], order), 12):
+                if int.from_bytes(data[entry:entry + 2], order) == 0x0112:
+                    return int.from_bytes(data[entry + 8:entry + 10], order)
+            return 1
+        pos += 2 + length
+    return 1
+
+def read_image_rgb(path):
+    """Decode an image file as 3-channel RGB uint8 (None if it cannot be read)"""
+    # One large read, then decode from memory: imread's many small reads are
+    # slow when the RealityCapture folder is on a network share
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None
+    if not data:
+        return None
+    if (HAS_TURBOJPEG and path.lower().endswith(('.jpg', '.jpeg'))
+            and jpeg_exif_orientation(data) == 1):
+        # libjpeg-turbo decodes JPEG photos noticeably faster than stock libjpeg.
+        # It ignores EXIF orientation, so rotated photos go through OpenCV, which applies it
+        try:
+            return _turbo_jpeg.decode(data, pixel_format=TJPF_RGB)
+        except (OSError, ValueError):
+            pass
+    buf = np.frombuffer(data, dtype=np.uint8)
+    if hasattr(cv2, 'IMREAD_COLOR_RGB'):
+        # OpenCV 4.11+: the decoder emits RGB directly
+        return cv2.imdecode(buf, cv2.IMREAD_COLOR_RGB)
+    image = cv2.imdecode(buf, cv2.IMREAD_COLOR)
+    return cv2.cvtColor(image, cv2.COLOR_BGR2RGB) if image is not None else None
+
+def read_pixels_from_image(image):
+    """Read a Blender image into a top-down RGBA uint8 array"""
+    width, height = image.size
+    pixels = get_pixel_buffer(width * height * 4)
+    image.pixels.foreach_get(pixels)
+    pixels *= 255.0
+    pixels += 0.5
+    result = np.empty((height, width, 4), dtype=np.uint8)
+    np.copyto(result, pixels.reshape(height, width, 4)[::-1], casting='unsafe')
+    return result
+
+def remember_render_pixels(image, rgba_array):
+    """Keep the uint8 pixels just uploaded to the render image so they need not be read back"""
+    global _render_pixels
+    rgba_array.flags.writeable = False
+    _render_pixels = (image.as_pointer(), tuple(image.size), rgba_array)
+
+def get_render_pixels(image):
+    """Pixels of the render image, from the upload-time copy when it is still current"""
+    if (_render_pixels is not None and _render_pixels[0] == image.as_pointer()
+            and _render_pixels[1] == tuple(image.size)):
+        return _render_pixels[2]
+    return read_pixels_from_image(image)
+
+def srgb_encode(linear):
+    """Apply the sRGB transfer function to linear values in [0, 1]"""
+    linear = np.clip(linear, 0.0, 1.0)
+    return np.where(linear <= 0.0031308, linear * 12.92, 1.055 * np.power(linear, 1.0 / 2.4) - 0.055)
+
+def get_render_result_pixels(scene):
+    """Return the last render as an RGBA uint8 array straight from memory, or None.
+    
+    Blender does not expose 'Render Result' pixels in every build, and the values are
+    scene-linear with premultiplied alpha. This only succeeds when the color management
+    reduces to plain sRGB (Standard view transform, sRGB display, no look, zero exposure,
+    unit gamma, no curves); the alpha is divided out as the saved PNG would have it.
+    Callers fall back to saving the render otherwise.
+    """
+    image = bpy.data.images.get("Render Result")
+    view = scene.view_settings
+    if (image is None or view.view_transform != 'Standard' or view.look != 'None'
+            or view.exposure != 0.0 or view.gamma != 1.0 or view.use_curve_mapping
+            or scene.display_settings.display_device != 'sRGB'):
+        return None
+    
+    scale = scene.render.resolution_percentage / 100.0
+    width = int(scene.render.resolution_x * scale)
+    height = int(scene.render.resolution_y * scale)
+    if len(image.pixels) != width * height * 4:
+        return None
+    
+    pixels = get_pixel_buffer(width * height * 4)
+    image.pixels.foreach_get(pixels)
+    pixels = pixels.reshape(height, width, 4)[::-1]
+    
+    # Straight alpha, as in the saved PNG: matters for the antialiased silhouette edges
+    alpha = pixels[:,:,3:]
+    rgb = np.divide(pixels[:,:,:3], alpha, out=pixels[:,:,:3].copy(), where=alpha > 0)
+    
+    render_array = np.empty((height, width, 4), dtype=np.uint8)
+    render_array[:,:,:3] = srgb_encode(rgb) * 255.0 + 0.5
+    render_array[:,:,3] = np.clip(pixels[:,:,3], 0.0, 1.0) * 255.0 + 0.5
+    return render_array
+
+def get_torch_ssim():
+    """(torch, torchmetrics SSIM function) imported on first use, or None without CUDA"""
+    global _torch_ssim
+    if _torch_ssim is None:
+        try:
+            import torch
+            from torchmetrics.functional import structural_similarity_index_measure
+            _torch_ssim = (torch, structural_similarity_index_measure) if torch.cuda.is_available() else False
+        except ImportError:
+            _torch_ssim = False
+    return _torch_ssim or None
+
+def ssim_torch(img1, img2, fast=False):
+    """SSIM of two single-channel uint8 images on a CUDA device via torchmetrics, or None.
+    
+    Same 11x11 window (Gaussian sigma 1.5, or uniform when fast is True) and
+    population covariance as ssim_cv2. The full SSIM map is requested and the
+    window border cropped here exactly as ssim_cv2 does, rather than relying on
+    torchmetrics' own reduction. float32 is used throughout, since half
+    precision loses too much in the variance terms.
+    """
+    backend = get_torch_ssim()
+    if backend is None:
+        return None
+    torch, torch_ssim = backend
+    
+    def to_tensor(img):
+        return torch.from_numpy(np.ascontiguousarray(img)).to('cuda', torch.float32)[None, None]
+    
+    pad = 5
+    with torch.no_grad():
+        _, ssim_map = torch_ssim(to_tensor(img1), to_tensor(img2), gaussian_kernel=not fast,
+                                 sigma=1.5, kernel_size=11, data_range=255.0, return_full_image=True)
+        value = ssim_map[..., pad:-pad, pad:-pad].mean(dtype=torch.float64)
+    return float(value)
+
+def evaluation_shape(shape, max_dim):
+    """(height, width) that fits shape within max_dim on its longer side (0 = unchanged)"""
+    height, width = shape[:2]
+    if max_dim <= 0 or max(height, width) <= max_dim:
+        return (height, width)
+    scale = max_dim / max(height, width)
+    return (max(1, int(round(height * scale))), max(1, int(round(width * scale))))
+
+def get_ssim_downsample(rc_metrics, shape):
+    """Downsample factor for SSIM from the ssim_downsample setting ('FIT' clamps the long edge)"""
+    if rc_metrics is None:
+        return 1
+    if rc_metrics.ssim_downsample == 'FIT':
+        return max(1.0, max(shape[:2]) / SSIM_FIT_SIZE)
+    return int(rc_metrics.ssim_downsample)
+
+def downsample_for_ssim(img1, img2, factor):
+    """Shrink both images by factor (box filter) before SSIM; PSNR stays full-res"""
+    # Never shrink the short side below the 11 px SSIM window
+    factor = min(factor, min(img1.shape[:2]) / 11.0)
+    if factor <= 1:
+        return img1, img2
+    scale = 1.0 / factor
+    return (cv2.resize(img1, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA),
+            cv2.resize(img2, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA))
+
+def get_tile_executor():
+    """Shared worker pool for the tiled SSIM, created on first use"""
+    global _tile_executor
+    if _tile_executor is None:
+        _tile_executor = ThreadPoolExecutor(max_workers=os.cpu_count() or 4,
+                                            thread_name_prefix="rcmetrics_ssim")
+    return _tile_executor
+
+def _ssim_map_cv2(img1, img2, fast, win_size=11, sample_covariance=False):
+    C1 = (0.01 * 255) ** 2
+    C2 = (0.03 * 255) ** 2
+    
+    a = img1.astype(np.float32)
+    b = img2.astype(np.float32)
+    
+    def window(x):
+        if fast:
+            return cv2.blur(x, (win_size, win_size), borderType=cv2.BORDER_REFLECT)
+        return cv2.GaussianBlur(x, (11, 11), 1.5, borderType=cv2.BORDER_REFLECT)
+    
+    mu1 = window(a)
+    mu2 = window(b)
+    mu1_sq = mu1 * mu1
+    mu2_sq = mu2 * mu2
+    mu1_mu2 = mu1 * mu2
+    sigma1_sq = window(a * a) - mu1_sq
+    sigma2_sq = window(b * b) - mu2_sq
+    sigma12 = window(a * b) - mu1_mu2
+    
+    if sample_covariance:
+        # Unbiased (N - 1) estimates, as skimage does by default
+        n = win_size * win_size
+        cov_norm = n / (n - 1)
+        sigma1_sq *= cov_norm
+        sigma2_sq *= cov_norm
+        sigma12 *= cov_norm
+    
+    return ((2 * mu1_mu2 + C1) * (2 * sigma12 + C2)) / ((mu1_sq + mu2_sq + C1) * (sigma1_sq + sigma2_sq + C2))
+
+def ssim_cv2(img1, img2, mask=None, fast=False, win_size=11, sample_covariance=False):
+    """SSIM of two single-channel uint8 images using OpenCV filters.
+    
+    Matches skimage's Gaussian SSIM (sigma 1.5, 11x11 window, population covariance),
+    or a uniform win_size window when fast is True (sample_covariance selects the
+    N - 1 normalisation, see SSIM_DEFAULT_CV2_KWARGS). If a mask is given the SSIM map is
+    averaged over the masked pixels only, otherwise the window border is cropped as
+    skimage does. Raises ValueError, as skimage does, when no pixel is left to average
+    (image smaller than the window, or an empty mask).
+    
+    Large images are processed in SSIM_TILE_SIZE tiles with a halo of one window
+    radius, so the float intermediates stay cache-sized; the result is identical.
+    """
+    pad = (win_size - 1) // 2 if fast else 5
+    height, width = img1.shape[:2]
+    
+    def tile_sum(origin):
+        y0, x0 = origin
+        y1 = min(y0 + SSIM_TILE_SIZE, height)
+        x1 = min(x0 + SSIM_TILE_SIZE, width)
+        hy0, hy1 = max(y0 - pad, 0), min(y1 + pad, height)
+        hx0, hx1 = max(x0 - pad, 0), min(x1 + pad, width)
+        
+        ssim_map = _ssim_map_cv2(img1[hy0:hy1, hx0:hx1], img2[hy0:hy1, hx0:hx1], fast,
+                                 win_size, sample_covariance)
+        
+        if mask is not None:
+            tile_mask = mask[y0:y1, x0:x1]
+            core = ssim_map[y0 - hy0:y1 - hy0, x0 - hx0:x1 - hx0]
+            return float(core[tile_mask].sum(dtype=np.float64)), cv2.countNonZero(tile_mask.view(np.uint8))
+        
+        # Only pixels at least one window radius from the image border count
+        cy0, cy1 = max(y0, pad), min(y1, height - pad)
+        cx0, cx1 = max(x0, pad), min(x1, width - pad)
+        if cy0 >= cy1 or cx0 >= cx1:
+            return 0.0, 0
+        core = ssim_map[cy0 - hy0:cy1 - hy0, cx0 - hx0:cx1 - hx0]
+        return float(core.sum(dtype=np.float64)), core.size
+    
+    origins = [(y0, x0) for y0 in range(0, height, SSIM_TILE_SIZE) for x0 in range(0, width, SSIM_TILE_SIZE)]
+    if len(origins) > 1 and (os.cpu_count() or 1) > 1:
+        # Tiles are independent and OpenCV/NumPy release the GIL, so run them in parallel
+        sums = list(get_tile_executor().map(tile_sum, origins))
+    else:
+        sums = [tile_sum(origin) for origin in origins]
+    
+    total = sum(tile_total for tile_total, _ in sums)
+    count = sum(tile_count for _, tile_count in sums)
+    if not count:
+        # Nothing to average: report it rather than returning a score of 0
+        if mask is not None:
+            raise ValueError("No masked pixels to compute SSIM on")
+        raise ValueError(f"Image too small for SSIM ({width}x{height} px, window is {2 * pad + 1} px)")
+    return total / count
+
+if HAS_NUMBA:
+    @njit(fastmath=True, cache=True)
+    def _reflect_index(i, n):
+        """Mirror an out-of-range index (matches cv2.BORDER_REFLECT)"""
+        if i < 0:
+            return -i - 1
+        if i >= n:
+            return 2 * n - i - 1
+        return i
+
+    @njit(fastmath=True, cache=True)
+    def _window_ssim(render_gray, original_gray, y, x, weights):
+        """SSIM of the window centred on (y, x)"""
+        height, width = render_gray.shape
+        radius = weights.shape[0] // 2
+        mu1 = 0.0
+        mu2 = 0.0
+        m11 = 0.0
+        m22 = 0.0
+        m12 = 0.0
+        for dy in range(-radius, radius + 1):
+            yy = _reflect_index(y + dy, height)
+            wy = weights[dy + radius]
+            for dx in range(-radius, radius + 1):
+                xx = _reflect_index(x + dx, width)
+                wgt = wy * weights[dx + radius]
+                a = float(render_gray[yy, xx])
+                b = float(original_gray[yy, xx])
+                mu1 += wgt * a
+                mu2 += wgt * b
+                m11 += wgt * a * a
+                m22 += wgt * b * b
+                m12 += wgt * a * b
+        C1 = (0.01 * 255) ** 2
+        C2 = (0.03 * 255) ** 2
+        sigma1_sq = m11 - mu1 * mu1
+        sigma2_sq = m22 - mu2 * mu2
+        sigma12 = m12 - mu1 * mu2
+        return ((2 * mu1 * mu2 + C1) * (2 * sigma12 + C2)) / ((mu1 * mu1 + mu2 * mu2 + C1) * (sigma1_sq + sigma2_sq + C2))
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def edge_metrics_kernel(render_gray, original_gray, render_rgb, original_rgb, mask, weights):
+        """Sum of squared RGB differences and of SSIM map values over the masked pixels"""
+        height, width = mask.shape
+        sq_rows = np.zeros(height)
+        ssim_rows = np.zeros(height)
+        for y in prange(height):
+            sq_sum = 0.0
+            ssim_sum = 0.0
+            for x in range(width):
+                if mask[y, x]:
+                    for c in range(3):
+                        d = float(render_rgb[y, x, c]) - float(original_rgb[y, x, c])
+                        sq_sum += d * d
+                    ssim_sum += _window_ssim(render_gray, original_gray, y, x, weights)
+            sq_rows[y] = sq_sum
+            ssim_rows[y] = ssim_sum
+        return sq_rows.sum(), ssim_rows.sum()
 
 class RCMETRICS_OT_Render(bpy.types.Operator):
     """Render the current camera view"""
@@ -46,152 +558,150 @@ class RCMETRICS_OT_Render(bpy.types.Operator):
     
     def setup_scene_for_rendering(self, context, render_selected_only=False, selection_type='MESH', selected_mesh=None, selected_collection=None):
         """Setup the scene for rendering, optionally hiding other objects"""
-        # Store original visibility states
-        original_visibilities = {}
-        for obj in context.scene.objects:
-            # Only process mesh objects
-            if obj.type == 'MESH':
-                original_visibilities[obj.name] = obj.hide_render
+        objects = context.scene.objects
+        count = len(objects)
+        
+        # Store original visibility states (bulk read, one entry per scene object)
+        original_visibilities = np.empty(count, dtype=bool)
+        objects.foreach_get('hide_render', original_visibilities)
         
         # If we're only rendering the selected mesh/collection, hide everything else
         if render_selected_only:
+            keep = None
             if selection_type == 'MESH' and selected_mesh:
                 self.report({'INFO'}, f"Rendering only selected mesh: {selected_mesh}")
-                for obj in context.scene.objects:
-                    if obj.type == 'MESH':
-                        if obj.name == selected_mesh:
-                            obj.hide_render = False  # Show the selected mesh
-                        else:
-                            obj.hide_render = True   # Hide other meshes
+                keep = np.fromiter((obj.name == selected_mesh for obj in objects), dtype=bool, count=count)
             
             elif selection_type == 'COLLECTION' and selected_collection:
                 self.report({'INFO'}, f"Rendering only objects in collection: {selected_collection}")
                 collection = bpy.data.collections.get(selected_collection)
                 
                 if collection:
-                    # Get all objects in the collection (including nested ones)
-                    collection_objects = set()
-                    
-                    def get_objects_from_collection(coll, obj_set):
-                        # Add direct objects
-                        for obj in coll.objects:
-                            if obj.type == 'MESH':
-                                obj_set.add(obj.name)
-                        
-                        # Add objects from child collections
-                        for child_coll in coll.children:
-                            get_objects_from_collection(child_coll, obj_set)
-                    
-                    get_objects_from_collection(collection, collection_objects)
-                    
-                    # Show/hide objects based on collection membership
-                    for obj in context.scene.objects:
-                        if obj.type == 'MESH':
-                            if obj.name in collection_objects:
-                                obj.hide_render = False  # Show collection objects
-                            else:
-                                obj.hide_render = True   # Hide other objects
+                    # All mesh objects in the collection, including nested ones (all_objects
+                    # is already flattened), identified by pointer rather than by name
+                    collection_objects = {obj.as_pointer() for obj in collection.all_objects if obj.type == 'MESH'}
+                    keep = np.fromiter((obj.as_pointer() in collection_objects for obj in objects),
+                                       dtype=bool, count=count)
+            
+            if keep is not None:
+                # Show kept meshes, hide other meshes, leave non-mesh objects as they were
+                is_mesh = np.fromiter((obj.type == 'MESH' for obj in objects), dtype=bool, count=count)
+                objects.foreach_set('hide_render', np.where(is_mesh, ~keep, original_visibilities))
         
         return original_visibilities
 
     def restore_scene_after_rendering(self, context, original_visibilities):
         """Restore the original visibility states of objects"""
-        for obj_name, hide_state in original_visibilities.items():
-            obj = context.scene.objects.get(obj_name)
-            if obj:
-                obj.hide_render = hide_state
+        context.scene.objects.foreach_set('hide_render', original_visibilities)
+    
+    def apply_fast_cycles(self, context):
+        """Switch Cycles to adaptive sampling (and the GPU when one is enabled) for metric renders.
+        
+        Returns the (owner, attribute, value) settings to restore afterwards.
+        """
+        scene = context.scene
+        if scene.render.engine != 'CYCLES' or not scene.rc_metrics.fast_cycles:
+            return []
+        cycles = scene.cycles
+        changes = [(cycles, 'use_adaptive_sampling', True), (cycles, 'adaptive_threshold', 0.1)]
+        
+        addon = context.preferences.addons.get('cycles')
+        if addon and addon.preferences.compute_device_type != 'NONE':
+            addon.preferences.get_devices()
+            if any(device.use and device.type != 'CPU' for device in addon.preferences.devices):
+                changes.append((cycles, 'device', 'GPU'))
+        
+        saved = [(owner, attr, getattr(owner, attr)) for owner, attr, _ in changes]
+        for owner, attr, value in changes:
+            setattr(owner, attr, value)
+        return saved
     
     def render_current_view(self, context):
         """Render the current view and return the render result"""
+        cycles_saved = []
+        # Store original render settings; they are restored on every exit path
+        render = context.scene.render
+        original_filepath = render.filepath
+        original_format = render.image_settings.file_format
+        original_color_mode = render.image_settings.color_mode
+        original_film_transparent = render.film_transparent  # 투명 설정 저장
+        original_compression = render.image_settings.compression
+        # Fixed temporary path, reused and removed after every read-back
+        temp_file = os.path.join(tempfile.gettempdir(), "rc_metrics_render.png")
         try:
-            # Store original render settings
-            original_filepath = context.scene.render.filepath
-            original_format = context.scene.render.image_settings.file_format
-            original_color_mode = context.scene.render.image_settings.color_mode
-            original_film_transparent = context.scene.render.film_transparent  # 투명 설정 저장
-            
             # 투명 배경 설정 활성화
             context.scene.render.film_transparent = True
             
-            # Create a temporary file path for saving the render with a unique timestamp
-            import time
-            temp_dir = tempfile.gettempdir()
-            timestamp = int(time.time())
-            temp_file = os.path.join(temp_dir, f"temp_render_{timestamp}.png")
-            
             # Set render to save to the temporary file with RGBA
             context.scene.render.filepath = temp_file
             context.scene.render.image_settings.file_format = 'PNG'
             context.scene.render.image_settings.color_mode = 'RGBA'  # Include alpha channel
+            context.scene.render.image_settings.compression = 0  # Read straight back, so skip zlib
             
-            # Render the image and save to file
-            self.report({'INFO'}, f"Rendering to temporary file: {temp_file}")
+            # Render without writing; the pixels are taken from memory when possible
             self.report({'INFO'}, "Transparent background enabled for rendering")
-            bpy.ops.render.render(write_still=True)
-            
-            # Check if file was created
-            if not os.path.exists(temp_file):
-                self.report({'ERROR'}, f"Temporary render file was not created: {temp_file}")
-                return None, None
-            
-            # Load the saved image using OpenCV to get the RGBA data
-            import cv2
-            render_array = cv2.imread(temp_file, cv2.IMREAD_UNCHANGED)  # Load with alpha channel
-            if render_array is None:
-                self.report({'ERROR'}, f"Could not read temporary render file with OpenCV: {temp_file}")
-                return None, None
-                
-            # Convert from BGRA to RGBA if needed
-            if render_array.shape[2] == 4:  # Check if we have alpha channel
-                # OpenCV uses BGRA, convert to RGBA
-                b, g, r, a = cv2.split(render_array)
-                render_array = cv2.merge([r, g, b, a])
+            cycles_saved = self.apply_fast_cycles(context)
+            bpy.ops.render.render(write_still=False)
+            
+            render_array = get_render_result_pixels(context.scene)
+            if render_array is not None:
+                # No PNG encode/decode: upload the pixels as a generated image
+                render_img = write_pixels_to_image("RC_Current_Render", render_array)
+                self.report({'INFO'}, f"Loaded render from memory with shape {render_array.shape}")
             else:
-                # No alpha channel, just convert BGR to RGB
-                render_array = cv2.cvtColor(render_array, cv2.COLOR_BGR2RGB)
-            
-            self.report({'INFO'}, f"Successfully loaded render with shape {render_array.shape}")
-            
-            # Also load the render result into Blender's image system for later use
-            # Check if image already exists and replace it
-            render_img = bpy.data.images.get("RC_Current_Render")
-            if render_img:
-                # Image exists, so replace its data
-                render_img.filepath = temp_file
-                render_img.reload()
-                self.report({'INFO'}, "Updated existing RC_Current_Render image")
-            else:
-                # Create new image
-                render_img = bpy.data.images.load(temp_file, check_existing=False)
-                render_img.name = "RC_Current_Render"
-                self.report({'INFO'}, "Created new RC_Current_Render image")
-            
-            # Restore original render settings
-            context.scene.render.filepath = original_filepath
-            context.scene.render.image_settings.file_format = original_format
-            context.scene.render.image_settings.color_mode = original_color_mode
-            context.scene.render.film_transparent = original_film_transparent  # 투명 설정 복원
-            
-            # We'll keep the temp file for now so we can use it later
-            # It will be cleaned up when Blender closes
+                # Fall back to saving the render result (view transform applied) and reading it back
+                self.report({'INFO'}, f"Saving render to temporary file: {temp_file}")
+                bpy.data.images["Render Result"].save_render(temp_file, scene=context.scene)
+                
+                # Check if file was created
+                if not os.path.exists(temp_file):
+                    self.report({'ERROR'}, f"Temporary render file was not created: {temp_file}")
+                    return None, None
+                
+                if HAS_PIL:
+                    # Pillow decodes straight to RGBA, so no channel swap is needed
+                    with Image.open(temp_file) as pil_img:
+                        render_array = np.asarray(pil_img.convert('RGBA'))
+                else:
+                    # Load the saved image using OpenCV to get the RGBA data
+                    render_array = cv2.imread(temp_file, cv2.IMREAD_UNCHANGED)  # Load with alpha channel
+                    if render_array is None:
+                        self.report({'ERROR'}, f"Could not read temporary render file with OpenCV: {temp_file}")
+                        return None, None
+                        
+                    # Convert from BGRA to RGBA if needed
+                    if render_array.shape[2] == 4:  # Check if we have alpha channel
+                        # OpenCV uses BGRA, convert to RGBA (single SIMD pass)
+                        render_array = cv2.cvtColor(render_array, cv2.COLOR_BGRA2RGBA)
+                    else:
+                        # No alpha channel, just convert BGR to RGB
+                        render_array = cv2.cvtColor(render_array, cv2.COLOR_BGR2RGB)
+                
+                self.report({'INFO'}, f"Successfully loaded render with shape {render_array.shape}")
                 
+                # Upload the pixels as a generated image; the temp file is removed below
+                render_img = write_pixels_to_image("RC_Current_Render", render_array)
+            remember_render_pixels(render_img, render_array)
+            
             return render_array, render_img
             
         except Exception as e:
-            import traceback
             self.report({'ERROR'}, f"Error rendering view: {str(e)}")
             traceback.print_exc()
-            
-            # Restore original render settings if they were set
-            try:
-                context.scene.render.filepath = original_filepath
-                context.scene.render.image_settings.file_format = original_format
-                context.scene.render.image_settings.color_mode = original_color_mode
-                context.scene.render.film_transparent = original_film_transparent  # 오류 발생해도 투명 설정 복원
-            except:
-                pass
-            
             return None, None
+        
+        finally:
+            # Restore original render settings, including after early returns and errors
+            render.filepath = original_filepath
+            render.image_settings.file_format = original_format
+            render.image_settings.color_mode = original_color_mode
+            render.film_transparent = original_film_transparent  # 투명 설정 복원
+            render.image_settings.compression = original_compression
+            for owner, attr, value in cycles_saved:
+                setattr(owner, attr, value)
+            # A failed read-back must not leave the fallback file behind either
+            if os.path.exists(temp_file):
+                os.remove(temp_file)
     
     def show_image_in_editor(self, context, image):
         """Open and display an image in the Image Editor"""
@@ -226,6 +736,10 @@ class RCMETRICS_OT_Render(bpy.types.Operator):
             self.report({'INFO'}, f"Displaying {image.name} in Image Editor")
     
     def execute(self, context):
+        if not HAS_DEPENDENCIES:
+            self.report({'ERROR'}, DEPENDENCY_ERROR)
+            return {'CANCELLED'}
+        
         try:
             # Check if we have active camera with background image
             camera_ok, bg_image = self.check_active_camera(context)
@@ -277,7 +791,6 @@ class RCMETRICS_OT_Render(bpy.types.Operator):
             return {'FINISHED'}
                 
         except Exception as e:
-            import traceback
             self.report({'ERROR'}, f"Unexpected error: {str(e)}")
             traceback.print_exc()
             return {'CANCELLED'}
@@ -320,39 +833,39 @@ class RCMETRICS_OT_Compare(bpy.types.Operator):
             image_editor.spaces.active.image = image
             self.report({'INFO'}, f"Displaying {image.name} in Image Editor")
     
-    def create_diff_image(self, render_array, original_img, context):
+    def create_diff_image(self, render_array, original_img, context, diff_rgb=None):
         """Create a difference image between rendered and original images"""
         try:
-            import cv2
-            
             # Get the visualization preferences
             rc_metrics = context.scene.rc_metrics
             diff_mode = rc_metrics.diff_view_mode
             diff_multiplier = rc_metrics.diff_multiplier
             
-            # Create a difference image (absolute difference)
+            # Contrast boost as a 256-entry lookup table (saturating, truncated like the
+            # original per-pixel clip().astype(np.uint8))
+            contrast_lut = np.clip(np.arange(256) * diff_multiplier, 0, 255).astype(np.uint8)
+            
+            # Work buffers are reused between compares of the same size
+            bufs = get_diff_buffers(render_array.shape[:2])
+            diff_img = bufs['diff']
+            
+            # Create a difference image (absolute difference), unless the caller already has it
+            if diff_rgb is None:
+                diff_rgb = compute_abs_diff(render_array, original_img)
             if render_array.shape[2] == 4:  # With alpha channel
                 # Create mask from alpha channel (1 for solid pixels, 0 for transparent)
                 alpha_mask = render_array[:,:,3] > 0
                 
-                # Initialize diff image with zeros (black transparent)
-                diff_img = np.zeros_like(render_array)
-                
                 # Calculate absolute difference only for non-transparent pixels
-                for c in range(3):  # RGB channels
-                    diff_channel = np.abs(render_array[:,:,c].astype(np.int16) - 
-                                        original_img[:,:,c].astype(np.int16))
-                    # Only assign diff values to non-transparent pixels
-                    diff_img[:,:,c] = np.where(alpha_mask, diff_channel, 0)
+                # (one broadcast multiply over RGB instead of a per-channel loop)
+                np.multiply(diff_rgb, alpha_mask[:,:,None], out=diff_img[:,:,:3], casting='unsafe')
                 
                 # Set alpha channel (1 where mask is true)
-                diff_img[:,:,3] = np.where(alpha_mask, 255, 0)
+                np.multiply(alpha_mask, 255, out=diff_img[:,:,3], casting='unsafe')
             else:
                 # No alpha channel, just calculate absolute difference for all pixels
-                diff_img = cv2.absdiff(render_array[:,:,:3], original_img)
-                # Add alpha channel
-                alpha_channel = np.ones((diff_img.shape[0], diff_img.shape[1]), dtype=np.uint8) * 255
-                diff_img = cv2.merge([diff_img[:,:,0], diff_img[:,:,1], diff_img[:,:,2], alpha_channel])
+                diff_img[:,:,:3] = diff_rgb
+                diff_img[:,:,3] = 255
             
             # Create a visualization based on the selected mode
             if diff_mode == 'HEATMAP':
@@ -360,14 +873,12 @@ class RCMETRICS_OT_Compare(bpy.types.Operator):
                 diff_gray = cv2.cvtColor(diff_img[:,:,:3], cv2.COLOR_RGB2GRAY)
                 
                 # Apply heatmap colormap
-                diff_heatmap = cv2.applyColorMap((diff_gray * diff_multiplier).clip(0, 255).astype(np.uint8), 
-                                                cv2.COLORMAP_JET)
+                diff_heatmap = cv2.applyColorMap(cv2.LUT(diff_gray, contrast_lut), cv2.COLORMAP_JET)
                 
                 # Create RGBA heatmap
                 alpha_mask = diff_img[:,:,3] > 0
-                heatmap_rgba = np.zeros_like(diff_img)
-                for c in range(3):
-                    heatmap_rgba[:,:,c] = np.where(alpha_mask, diff_heatmap[:,:,c], 0)
+                heatmap_rgba = bufs['vis']
+                np.multiply(diff_heatmap, alpha_mask[:,:,None], out=heatmap_rgba[:,:,:3], casting='unsafe')
                 heatmap_rgba[:,:,3] = diff_img[:,:,3]  # Keep original alpha
                 
                 diff_img = heatmap_rgba
@@ -377,78 +888,65 @@ class RCMETRICS_OT_Compare(bpy.types.Operator):
                 diff_gray = cv2.cvtColor(diff_img[:,:,:3], cv2.COLOR_RGB2GRAY)
                 
                 # Enhance contrast
-                diff_gray = (diff_gray * diff_multiplier).clip(0, 255).astype(np.uint8)
+                diff_gray = cv2.LUT(diff_gray, contrast_lut)
                 
                 # Create RGBA grayscale
                 alpha_mask = diff_img[:,:,3] > 0
-                gray_rgba = np.zeros_like(diff_img)
-                for c in range(3):
-                    gray_rgba[:,:,c] = np.where(alpha_mask, diff_gray, 0)
+                gray_rgba = bufs['vis']
+                np.multiply(diff_gray[:,:,None], alpha_mask[:,:,None], out=gray_rgba[:,:,:3], casting='unsafe')
                 gray_rgba[:,:,3] = diff_img[:,:,3]  # Keep original alpha
                 
                 diff_img = gray_rgba
             
             else:  # COLORIZED
                 # Increase brightness of difference for better visibility
-                diff_img[:,:,:3] = np.clip(diff_img[:,:,:3] * diff_multiplier, 0, 255).astype(np.uint8)
-            
-            # Save difference image to a temporary file with a unique timestamp
-            import time
-            temp_dir = tempfile.gettempdir()
-            timestamp = int(time.time())
-            diff_file = os.path.join(temp_dir, f"rc_diff_image_{timestamp}.png")
-            
-            # Save the difference image (with proper channel order for OpenCV)
-            r, g, b, a = cv2.split(diff_img)
-            diff_bgra = cv2.merge([b, g, r, a])
-            cv2.imwrite(diff_file, diff_bgra)
-            
-            # Load the difference image into Blender
-            # Check if difference image already exists and replace it
-            diff_blender_img = bpy.data.images.get("RC_Difference")
-            if diff_blender_img:
-                # Image exists, so replace its data
-                diff_blender_img.filepath = diff_file
-                diff_blender_img.reload()
-                self.report({'INFO'}, "Updated existing RC_Difference image")
-            else:
-                # Create new image
-                diff_blender_img = bpy.data.images.load(diff_file, check_existing=False)
-                diff_blender_img.name = "RC_Difference"
-                self.report({'INFO'}, "Created new RC_Difference image")
+                diff_img[:,:,:3] = cv2.LUT(diff_img[:,:,:3], contrast_lut)
+            
+            # Upload the difference pixels straight into Blender (no PNG round-trip)
+            diff_blender_img = write_pixels_to_image("RC_Difference", diff_img)
+            self.report({'INFO'}, "Updated RC_Difference image")
             
             # Open an image editor and display the difference image
             self.show_image_in_editor(context, diff_blender_img)
             
             return diff_blender_img
         except Exception as e:
-            import traceback
             self.report({'ERROR'}, f"Error creating difference image: {str(e)}")
             traceback.print_exc()
             return None
     
-    def ssim_color(self, img1, img2):
-        from skimage.metrics import structural_similarity as ssim
-        ssim_r = ssim(img1[:,:,0], img2[:,:,0], data_range=255)
-        ssim_g = ssim(img1[:,:,1], img2[:,:,1], data_range=255)
-        ssim_b = ssim(img1[:,:,2], img2[:,:,2], data_range=255)
+    def ssim_gray(self, img1, img2, fast=False, downsample=1):
+        """Grayscale SSIM, Gaussian-weighted unless fast mode is requested"""
+        img1, img2 = downsample_for_ssim(img1, img2, downsample)
+        kwargs = SSIM_FAST_KWARGS if fast else {'gaussian_weights': True, 'use_sample_covariance': False}
+        if HAS_GPU_SSIM and img1.size > GPU_SSIM_MIN_PIXELS:
+            # Large renders: run the same SSIM on the GPU via cuCIM
+            return float(gpu_ssim(cp.asarray(img1), cp.asarray(img2), data_range=255, **kwargs))
+        if HAS_TORCH_SSIM and img1.size > GPU_SSIM_MIN_PIXELS:
+            # No cuCIM, but PyTorch may have CUDA: use torchmetrics instead
+            value = ssim_torch(img1, img2, fast)
+            if value is not None:
+                return value
+        # Separable OpenCV filters; same result as skimage with these settings
+        return ssim_cv2(img1, img2, fast=fast)
+
+    def ssim_channels(self, img1, img2, fast=False, downsample=1):
+        """Per-channel (R, G, B) SSIM with the OpenCV filters"""
+        kwargs = {'fast': True} if fast else SSIM_DEFAULT_CV2_KWARGS
+        img1, img2 = downsample_for_ssim(img1, img2, downsample)
+        return [ssim_cv2(img1[:,:,c], img2[:,:,c], **kwargs) for c in range(3)]
+
+    def ssim_color(self, img1, img2, fast=False, downsample=1):
+        ssim_r, ssim_g, ssim_b = self.ssim_channels(img1, img2, fast, downsample)
         return (ssim_r + ssim_g + ssim_b) / 3
 
-    def ssim_weighted(self, img1, img2, weights):
-        from skimage.metrics import structural_similarity as ssim
-        ssim_r = ssim(img1[:,:,0], img2[:,:,0], data_range=255)
-        ssim_g = ssim(img1[:,:,1], img2[:,:,1], data_range=255)
-        ssim_b = ssim(img1[:,:,2], img2[:,:,2], data_range=255)
+    def ssim_weighted(self, img1, img2, weights, fast=False, downsample=1):
+        ssim_r, ssim_g, ssim_b = self.ssim_channels(img1, img2, fast, downsample)
         return ssim_r * weights[0] + ssim_g * weights[1] + ssim_b * weights[2]
 
-    def calculate_metrics_standard(self, render_array, original_img):
+    def calculate_metrics_standard(self, render_array, original_img, original_gray=None, diff_rgb=None):
         """Standard metrics calculation on entire image"""
         try:
-            # Import necessary modules
-            import cv2
-            from skimage.metrics import structural_similarity as ssim
-            from skimage.metrics import peak_signal_noise_ratio as psnr
-            
             # Convert to the same format for comparison
             render_comp = render_array[:,:,:3] if render_array.shape[2] >= 3 else render_array
             original_comp = original_img[:,:,:3] if original_img.shape[2] >= 3 else original_img
@@ -458,56 +956,68 @@ class RCMETRICS_OT_Compare(bpy.types.Operator):
             rc_metrics = scene.rc_metrics if hasattr(scene, 'rc_metrics') else None
             ssim_mode = rc_metrics.ssim_mode if rc_metrics else 'GRAY'
             ssim_weights = rc_metrics.ssim_weights if rc_metrics else (0.333, 0.333, 0.334)
-            
-            # Calculate metrics on the whole image
-            psnr_value = psnr(original_comp, render_comp)
-            
-            if ssim_mode == 'GRAY':
+            ssim_fast = rc_metrics.ssim_fast_mode if rc_metrics else False
+            ssim_downsample = get_ssim_downsample(rc_metrics, render_array.shape)
+            
+            # Calculate metrics on the whole image (PSNR from the shared absolute difference)
+            if diff_rgb is None:
+                diff_rgb = compute_abs_diff(render_array, original_img)
+            mse = cv2.norm(diff_rgb, cv2.NORM_L2SQR) / diff_rgb.size
+            psnr_value = 10 * math.log10(255.0 ** 2 / mse) if mse > 0 else float('inf')
+            
+            if mse == 0:
+                # Pixel-identical RGB: every per-channel SSIM is exactly 1, skip the filtering.
+                # Weighted mode sums the (unnormalised) weights, so it scores their sum.
+                ssim_value = float(sum(ssim_weights)) if ssim_mode == 'WEIGHTED' else 1.0
+            elif ssim_mode == 'GRAY':
                 # Convert to grayscale for SSIM calculation
-                original_gray = cv2.cvtColor(original_comp, cv2.COLOR_BGR2GRAY) if len(original_comp.shape) == 3 else original_comp
+                if original_gray is None:
+                    original_gray = cv2.cvtColor(original_comp, cv2.COLOR_RGB2GRAY) if len(original_comp.shape) == 3 else original_comp
                 rendered_gray = cv2.cvtColor(render_comp, cv2.COLOR_RGB2GRAY) if len(render_comp.shape) == 3 else render_comp
-                ssim_value = ssim(original_gray, rendered_gray, data_range=255, gaussian_weights=True, use_sample_covariance=False)
+                ssim_value = self.ssim_gray(original_gray, rendered_gray, ssim_fast, ssim_downsample)
             elif ssim_mode == 'COLOR':
-                ssim_value = self.ssim_color(original_comp, render_comp)
+                ssim_value = self.ssim_color(original_comp, render_comp, ssim_fast, ssim_downsample)
             elif ssim_mode == 'WEIGHTED':
-                ssim_value = self.ssim_weighted(original_comp, render_comp, ssim_weights)
+                ssim_value = self.ssim_weighted(original_comp, render_comp, ssim_weights, ssim_fast, ssim_downsample)
             else:
                 # fallback
-                original_gray = cv2.cvtColor(original_comp, cv2.COLOR_BGR2GRAY) if len(original_comp.shape) == 3 else original_comp
+                if original_gray is None:
+                    original_gray = cv2.cvtColor(original_comp, cv2.COLOR_RGB2GRAY) if len(original_comp.shape) == 3 else original_comp
                 rendered_gray = cv2.cvtColor(render_comp, cv2.COLOR_RGB2GRAY) if len(render_comp.shape) == 3 else render_comp
-                ssim_value = ssim(original_gray, rendered_gray, data_range=255, gaussian_weights=True, use_sample_covariance=False)
+                ssim_value = self.ssim_gray(original_gray, rendered_gray, ssim_fast, ssim_downsample)
             
             self.report({'INFO'}, f"Standard metrics - PSNR: {psnr_value:.2f}dB, SSIM: {ssim_value:.4f} (mode: {ssim_mode})")
             
             return psnr_value, ssim_value
             
         except Exception as e:
-            import traceback
             self.report({'ERROR'}, f"Error calculating standard metrics: {str(e)}")
             traceback.print_exc()
             return None, None
     
-    def calculate_metrics_no_transparent(self, render_array, original_img, context):
+    def calculate_metrics_no_transparent(self, render_array, original_img, context, original_gray=None,
+                                         diff_rgb=None):
         """Calculate metrics excluding transparent areas"""
         try:
-            # Import necessary modules
-            import cv2
-            import numpy as np
-            from skimage.metrics import structural_similarity as ssim
-            
             rc_metrics = context.scene.rc_metrics if hasattr(context.scene, 'rc_metrics') else None
             ssim_mode = rc_metrics.ssim_mode if rc_metrics else 'GRAY'
             ssim_weights = rc_metrics.ssim_weights if rc_metrics else (0.333, 0.333, 0.334)
+            ssim_fast = rc_metrics.ssim_fast_mode if rc_metrics else False
+            ssim_downsample = get_ssim_downsample(rc_metrics, render_array.shape)
+            
+            if diff_rgb is None:
+                diff_rgb = compute_abs_diff(render_array, original_img)
             
             # Create mask for non-transparent pixels
             if render_array.shape[2] == 4:
                 # 알파 채널을 분리합니다.
                 alpha = render_array[:,:,3]  # 첫 번째 이미지의 알파 채널
                 alpha_mask = alpha > 0  # 투명하지 않은 부분만 비교하도록 마스크 생성
+                alpha_mask_u8 = alpha_mask.view(np.uint8)  # OpenCV mask view, no copy
                 
                 # Print statistics about the transparency mask
                 total_pixels = alpha_mask.size
-                opaque_pixels = np.count_nonzero(alpha_mask)
+                opaque_pixels = cv2.countNonZero(alpha_mask_u8)
                 transparent_pixels = total_pixels - opaque_pixels
                 transparent_ratio = transparent_pixels / total_pixels * 100
                 
@@ -519,77 +1029,73 @@ class RCMETRICS_OT_Compare(bpy.types.Operator):
                 image2_rgb = original_img[:,:,:3] if original_img.shape[2] >= 3 else original_img  # 두 번째 이미지에서 RGB만 사용
                 
                 # Count non-transparent pixels
-                valid_pixel_count = np.count_nonzero(alpha_mask)
+                valid_pixel_count = opaque_pixels
                 if valid_pixel_count == 0:
                     self.report({'WARNING'}, "No valid (non-transparent) pixels to compare")
                     return 0, 0
                 
                 # 투명한 부분을 제외한 MSE 계산
-                # Use the requested calculation method
-                mse = np.mean((image1_rgb[alpha_mask] - image2_rgb[alpha_mask]) ** 2)
+                # Single masked reduction (no masked copies, no uint8 wraparound)
+                squared_diff = cv2.norm(diff_rgb, cv2.NORM_L2SQR, mask=alpha_mask_u8)
+                mse = squared_diff / (valid_pixel_count * 3)
                 
                 # PSNR 계산
                 if mse == 0:
                     psnr_value = float('inf')
                 else:
                     pixel_max = 255.0
-                    psnr_value = 20 * np.log10(pixel_max / np.sqrt(mse))
+                    psnr_value = 20 * math.log10(pixel_max / math.sqrt(mse))
             else:
                 # No alpha channel, use all pixels
-                mask = np.ones(render_array.shape[:2], dtype=bool)
                 image1_rgb = render_array
                 image2_rgb = original_img[:,:,:3] if original_img.shape[2] >= 3 else original_img
                 
                 # Calculate MSE and PSNR for non-alpha images
-                mse = np.mean((image1_rgb - image2_rgb) ** 2)
+                mse = cv2.norm(diff_rgb, cv2.NORM_L2SQR) / diff_rgb.size
                 if mse == 0:
                     psnr_value = float('inf')
                 else:
                     pixel_max = 255.0
-                    psnr_value = 20 * np.log10(pixel_max / np.sqrt(mse))
+                    psnr_value = 20 * math.log10(pixel_max / math.sqrt(mse))
             
             # SSIM 계산
             if ssim_mode == 'GRAY':
                 # Convert to grayscale for SSIM calculation
-                original_gray = cv2.cvtColor(image2_rgb, cv2.COLOR_BGR2GRAY) if len(image2_rgb.shape) == 3 else image2_rgb
+                if original_gray is None:
+                    original_gray = cv2.cvtColor(image2_rgb, cv2.COLOR_RGB2GRAY) if len(image2_rgb.shape) == 3 else image2_rgb
                 rendered_gray = cv2.cvtColor(image1_rgb, cv2.COLOR_RGB2GRAY) if len(image1_rgb.shape) == 3 else image1_rgb
                 if render_array.shape[2] == 4:
-                    rendered_gray_masked = np.where(alpha_mask, rendered_gray, 0)
-                    original_gray_masked = np.where(alpha_mask, original_gray, 0)
-                    ssim_value = ssim(rendered_gray_masked, original_gray_masked, 
-                                    data_range=255, gaussian_weights=True, 
-                                    use_sample_covariance=False)
+                    rendered_gray_masked = cv2.bitwise_and(rendered_gray, rendered_gray, mask=alpha_mask_u8)
+                    original_gray_masked = cv2.bitwise_and(original_gray, original_gray, mask=alpha_mask_u8)
+                    ssim_value = self.ssim_gray(rendered_gray_masked, original_gray_masked, ssim_fast, ssim_downsample)
                 else:
-                    ssim_value = ssim(rendered_gray, original_gray, 
-                                    data_range=255, gaussian_weights=True, 
-                                    use_sample_covariance=False)
+                    ssim_value = self.ssim_gray(rendered_gray, original_gray, ssim_fast, ssim_downsample)
             elif ssim_mode == 'COLOR':
-                ssim_value = self.ssim_color(image2_rgb, image1_rgb)
+                ssim_value = self.ssim_color(image2_rgb, image1_rgb, ssim_fast, ssim_downsample)
             elif ssim_mode == 'WEIGHTED':
-                ssim_value = self.ssim_weighted(image2_rgb, image1_rgb, ssim_weights)
+                ssim_value = self.ssim_weighted(image2_rgb, image1_rgb, ssim_weights, ssim_fast, ssim_downsample)
             else:
-                original_gray = cv2.cvtColor(image2_rgb, cv2.COLOR_BGR2GRAY) if len(image2_rgb.shape) == 3 else image2_rgb
+                if original_gray is None:
+                    original_gray = cv2.cvtColor(image2_rgb, cv2.COLOR_RGB2GRAY) if len(image2_rgb.shape) == 3 else image2_rgb
                 rendered_gray = cv2.cvtColor(image1_rgb, cv2.COLOR_RGB2GRAY) if len(image1_rgb.shape) == 3 else image1_rgb
-                ssim_value = ssim(rendered_gray, original_gray, data_range=255, gaussian_weights=True, use_sample_covariance=False)
+                ssim_value = self.ssim_gray(rendered_gray, original_gray, ssim_fast, ssim_downsample)
             
             self.report({'INFO'}, f"No-transparent metrics - PSNR: {psnr_value:.2f}dB, SSIM: {ssim_value:.4f}")
             
             return psnr_value, ssim_value
             
         except Exception as e:
-            import traceback
             self.report({'ERROR'}, f"Error calculating no-transparent metrics: {str(e)}")
             traceback.print_exc()
             return None, None
     
-    def calculate_metrics_edges_only(self, render_array, original_img, edge_thickness=20):
+    def calculate_metrics_edges_only(self, render_array, original_img, edge_thickness=20, ssim_fast=False,
+                                     original_gray=None):
         """Calculate metrics only on edge areas"""
         try:
-            # Import necessary modules
-            import cv2
-            import numpy as np
-            from skimage.metrics import structural_similarity as ssim
-            from skimage.metrics import peak_signal_noise_ratio as psnr
+            # Diagnostics are collected and reported once at the end, since every
+            # report() call goes through Blender's report/redraw machinery
+            log_lines = []
             
             # Get image dimensions
             height, width = render_array.shape[:2]
@@ -605,102 +1111,129 @@ class RCMETRICS_OT_Compare(bpy.types.Operator):
             
             # If we have alpha channel, combine with transparency mask
             alpha_mask = None
+            valid_pixel_count = None
             if render_array.shape[2] == 4:
                 # Only include edge pixels that are also non-transparent
                 alpha_mask = render_array[:,:,3] > 0
                 
                 # Print statistics about the transparency mask
                 total_pixels = alpha_mask.size
-                opaque_pixels = np.count_nonzero(alpha_mask)
+                opaque_pixels = cv2.countNonZero(alpha_mask.view(np.uint8))
                 transparent_pixels = total_pixels - opaque_pixels
                 transparent_ratio = transparent_pixels / total_pixels * 100
                 
-                self.report({'INFO'}, f"투명 픽셀: {transparent_pixels}/{total_pixels} ({transparent_ratio:.2f}%)")
-                self.report({'INFO'}, f"불투명 픽셀: {opaque_pixels}/{total_pixels} ({100-transparent_ratio:.2f}%)")
+                log_lines.append(f"투명 픽셀: {transparent_pixels}/{total_pixels} ({transparent_ratio:.2f}%)")
+                log_lines.append(f"불투명 픽셀: {opaque_pixels}/{total_pixels} ({100-transparent_ratio:.2f}%)")
                 
                 # Combine masks - only use edge pixels that are not transparent
                 combined_mask = np.logical_and(edge_mask, alpha_mask)
+                combined_count = cv2.countNonZero(combined_mask.view(np.uint8))
                 
                 # 만약 결합된 마스크에 유효한 픽셀이 없다면 알파 마스크만 사용
-                if np.count_nonzero(combined_mask) == 0:
+                if combined_count == 0:
                     self.report({'WARNING'}, "알파와 결합된 가장자리 마스크에 유효한 픽셀이 없습니다. 전체 불투명 영역을 사용합니다.")
-                    edge_mask = alpha_mask.copy()
+                    edge_mask = alpha_mask
+                    valid_pixel_count = opaque_pixels
                 else:
                     edge_mask = combined_mask
+                    valid_pixel_count = combined_count
             
             # Prepare images for comparison
             render_comp = render_array[:,:,:3]  # Just use RGB channels
             original_comp = original_img[:,:,:3] if original_img.shape[2] >= 3 else original_img
             
-            # Convert to grayscale for SSIM
-            original_gray = cv2.cvtColor(original_comp, cv2.COLOR_BGR2GRAY) if len(original_comp.shape) == 3 else original_comp
-            rendered_gray = cv2.cvtColor(render_comp, cv2.COLOR_RGB2GRAY) if len(render_comp.shape) == 3 else render_comp
-            
-            # Count valid edge pixels
-            valid_pixel_count = np.count_nonzero(edge_mask)
+            # Count valid edge pixels (already known when combined with alpha)
+            if valid_pixel_count is None:
+                valid_pixel_count = cv2.countNonZero(edge_mask.view(np.uint8))
             if valid_pixel_count == 0:
                 self.report({'WARNING'}, "No valid edge pixels to compare")
                 return 0, 0
             
             # 유효한 마스크 픽셀 비율 출력
             mask_ratio = valid_pixel_count / (height * width) * 100
-            self.report({'INFO'}, f"마스크 적용 픽셀 비율: {mask_ratio:.2f}% ({valid_pixel_count} / {height * width})")
-            
-            # Mask images for edge-only comparison
-            render_masked = np.zeros_like(render_comp)
-            original_masked = np.zeros_like(original_comp)
+            log_lines.append(f"마스크 적용 픽셀 비율: {mask_ratio:.2f}% ({valid_pixel_count} / {height * width})")
+            
+            # Crop to the mask's bounding box (plus the SSIM window radius) when that
+            # saves a meaningful amount of work, so only that region is converted to gray
+            rows = np.flatnonzero(edge_mask.any(axis=1))
+            cols = np.flatnonzero(edge_mask.any(axis=0))
+            y0, y1 = max(rows[0] - 5, 0), min(rows[-1] + 6, height)
+            x0, x1 = max(cols[0] - 5, 0), min(cols[-1] + 6, width)
+            if (y1 - y0) * (x1 - x0) < 0.7 * height * width:
+                render_crop = render_comp[y0:y1, x0:x1]
+                original_crop = original_comp[y0:y1, x0:x1]
+                ssim_mask = edge_mask[y0:y1, x0:x1]
+                if original_gray is not None:
+                    original_gray = original_gray[y0:y1, x0:x1]
+            else:
+                render_crop, original_crop, ssim_mask = render_comp, original_comp, edge_mask
             
-            for c in range(3):  # RGB channels
-                render_masked[:,:,c] = np.where(edge_mask, render_comp[:,:,c], 0)
-                original_masked[:,:,c] = np.where(edge_mask, original_comp[:,:,c], 0)
+            # Convert to grayscale for SSIM
+            if original_gray is None:
+                original_gray = cv2.cvtColor(original_crop, cv2.COLOR_RGB2GRAY) if len(original_crop.shape) == 3 else original_crop
+            rendered_gray = cv2.cvtColor(render_crop, cv2.COLOR_RGB2GRAY) if len(render_crop.shape) == 3 else render_crop
+            
+            # Dense masks on large renders: SSIM at a reduced resolution is
+            # practically indistinguishable and far cheaper (PSNR stays full-res)
+            downsample_ssim = valid_pixel_count > SSIM_MAX_SIZE * SSIM_MAX_SIZE and mask_ratio > 50.0
+            
+            if HAS_NUMBA and not downsample_ssim:
+                # Single pass over the edge pixels accumulating both the squared
+                # difference and the windowed SSIM
+                weights = SSIM_FAST_WINDOW if ssim_fast else SSIM_GAUSSIAN_WINDOW
+                squared_diff, ssim_sum = edge_metrics_kernel(
+                    rendered_gray, original_gray, render_crop, original_crop, ssim_mask, weights)
+                ssim_value = ssim_sum / valid_pixel_count
+            else:
+                # Squared difference over the masked pixels of all three channels,
+                # using OpenCV's native mask support (no masked copies)
+                squared_diff = cv2.norm(render_crop, original_crop, cv2.NORM_L2SQR,
+                                        mask=ssim_mask.view(np.uint8))
+                
+                if downsample_ssim:
+                    crop_height, crop_width = rendered_gray.shape[:2]
+                    scale = SSIM_MAX_SIZE / max(crop_height, crop_width)
+                    size = (max(1, round(crop_width * scale)), max(1, round(crop_height * scale)))
+                    rendered_gray = cv2.resize(rendered_gray, size, interpolation=cv2.INTER_AREA)
+                    original_gray = cv2.resize(original_gray, size, interpolation=cv2.INTER_AREA)
+                    ssim_mask = cv2.resize(ssim_mask.view(np.uint8), size, interpolation=cv2.INTER_NEAREST).view(bool)
+                
+                # Calculate SSIM on edge areas (SSIM map averaged over the edge mask)
+                ssim_value = ssim_cv2(rendered_gray, original_gray, mask=ssim_mask, fast=ssim_fast)
             
-            # Calculate MSE manually for PSNR
-            squared_diff = np.sum((render_masked.astype(np.float32) - original_masked.astype(np.float32))**2)
             mse = squared_diff / valid_pixel_count / 3  # Divide by valid pixels and channel count
-            psnr_value = 10 * np.log10((255**2) / mse) if mse > 0 else 100
-            
-            # Calculate SSIM on edge areas
-            rendered_gray_masked = np.where(edge_mask, rendered_gray, 0)
-            original_gray_masked = np.where(edge_mask, original_gray, 0)
-            ssim_value = ssim(rendered_gray_masked, original_gray_masked, 
-                            data_range=255, gaussian_weights=True, 
-                            use_sample_covariance=False)
+            if mse == 0:
+                # Identical edge pixels: same convention as the standard and no-transparent modes
+                psnr_value = float('inf')
+            else:
+                psnr_value = 10.0 * math.log10(65025.0 / mse)  # 255^2
             
-            self.report({'INFO'}, f"Edge-only metrics - PSNR: {psnr_value:.2f}dB, SSIM: {ssim_value:.4f}")
+            log_lines.append(f"Edge-only metrics - PSNR: {psnr_value:.2f}dB, SSIM: {ssim_value:.4f}")
             
             # Create visualization of edge mask for debugging
             # This helps to see which pixels were used in the comparison
-            edge_vis = np.zeros((height, width, 4), dtype=np.uint8)
-            edge_vis[edge_mask, 0] = 255  # Red channel for edge pixels
-            edge_vis[edge_mask, 3] = 200  # Alpha for edge pixels
-            
-            # 가장자리 마스크 시각화 저장
-            temp_dir = tempfile.gettempdir()
-            import time
-            timestamp = int(time.time())
-            edge_file = os.path.join(temp_dir, f"rc_edge_mask_{timestamp}.png")
-            cv2.imwrite(edge_file, cv2.cvtColor(edge_vis, cv2.COLOR_RGBA2BGRA))
-            
-            # 블렌더에 마스크 이미지 로드
-            edge_img = bpy.data.images.get("RC_Edge_Mask")
-            if edge_img:
-                edge_img.filepath = edge_file
-                edge_img.reload()
-                self.report({'INFO'}, "업데이트된 가장자리 마스크 이미지")
-            else:
-                edge_img = bpy.data.images.load(edge_file, check_existing=False)
-                edge_img.name = "RC_Edge_Mask"
-                self.report({'INFO'}, "생성된 가장자리 마스크 이미지")
+            # One packed RGBA word per pixel: red 255, alpha 200 for edge pixels.
+            # Stored little-endian so the bytes read R, G, B, A on any platform.
+            packed = np.where(edge_mask, np.uint32(200 << 24 | 255), np.uint32(0)).astype('<u4', copy=False)
+            edge_vis = packed.view(np.uint8).reshape(height, width, 4)
+            
+            # 가장자리 마스크를 디스크를 거치지 않고 블렌더 이미지로 직접 업로드
+            write_pixels_to_image("RC_Edge_Mask", edge_vis)
+            
+            self.report({'INFO'}, "\n".join(log_lines))
             
             return psnr_value, ssim_value
             
         except Exception as e:
-            import traceback
             self.report({'ERROR'}, f"Error calculating edge-only metrics: {str(e)}")
             traceback.print_exc()
             return None, None
     
     def execute(self, context):
+        if not HAS_DEPENDENCIES:
+            self.report({'ERROR'}, DEPENDENCY_ERROR)
+            return {'CANCELLED'}
+        
         try:
             # 렌더링된 이미지 확인
             render_img = bpy.data.images.get("RC_Current_Render")
@@ -709,21 +1242,22 @@ class RCMETRICS_OT_Compare(bpy.types.Operator):
                 return {'CANCELLED'}
             
             # 렌더링된 이미지 데이터 가져오기
-            render_path = bpy.path.abspath(render_img.filepath)
-            import cv2
-            import numpy as np
-            render_array = cv2.imread(render_path, cv2.IMREAD_UNCHANGED)
-            
-            if render_array is None:
-                self.report({'ERROR'}, f"Failed to read render image: {render_path}")
-                return {'CANCELLED'}
-                
-            # OpenCV는 BGRA, 우리는 RGBA가 필요
-            if render_array.shape[2] == 4:
-                b, g, r, a = cv2.split(render_array)
-                render_array = cv2.merge([r, g, b, a])
+            if render_img.source == 'GENERATED':
+                # 메모리에서 바로 생성된 렌더 이미지
+                render_array = get_render_pixels(render_img)
             else:
-                render_array = cv2.cvtColor(render_array, cv2.COLOR_BGR2RGB)
+                render_path = bpy.path.abspath(render_img.filepath)
+                render_array = cv2.imread(render_path, cv2.IMREAD_UNCHANGED)
+                
+                if render_array is None:
+                    self.report({'ERROR'}, f"Failed to read render image: {render_path}")
+                    return {'CANCELLED'}
+                    
+                # OpenCV는 BGRA, 우리는 RGBA가 필요
+                if render_array.shape[2] == 4:
+                    render_array = cv2.cvtColor(render_array, cv2.COLOR_BGRA2RGBA)
+                else:
+                    render_array = cv2.cvtColor(render_array, cv2.COLOR_BGR2RGB)
             
             # 활성 카메라의 배경 이미지 가져오기
             if not context.scene.camera:
@@ -743,30 +1277,46 @@ class RCMETRICS_OT_Compare(bpy.types.Operator):
                 self.report({'ERROR'}, "Active camera does not have a background image.")
                 return {'CANCELLED'}
             
-            # 원본 이미지 로드
+            # Optionally score at a reduced resolution: the render is shrunk here and
+            # the original is loaded straight at the same (cached) size
+            eval_shape = evaluation_shape(render_array.shape, context.scene.rc_metrics.eval_max_dim)
+            if eval_shape != render_array.shape[:2]:
+                render_array = cv2.resize(render_array, (eval_shape[1], eval_shape[0]),
+                                          interpolation=cv2.INTER_AREA)
+            
+            # 원본 이미지 로드 (디코딩 + 리사이즈 결과는 캐시됨)
             original_path = bpy.path.abspath(bg_image.filepath)
-            original_img = cv2.imread(original_path, cv2.IMREAD_UNCHANGED)
+            original_img = load_original_image(original_path, render_array.shape[:2])
             
             if original_img is None:
                 self.report({'ERROR'}, f"Failed to load original image: {original_path}")
                 return {'CANCELLED'}
-                
-            # 크기가 다르면 원본 이미지 리사이즈
-            if original_img.shape[:2] != render_array.shape[:2]:
-                original_img = cv2.resize(original_img, (render_array.shape[1], render_array.shape[0]),
-                                       interpolation=cv2.INTER_AREA)
+            if not original_aspect_matches(original_path, render_array.shape[:2]):
+                # Scaling is expected (resolution %, evaluation size), a different aspect ratio is not
+                self.report({'WARNING'}, "Original image and render have different aspect ratios; "
+                            "check the scene resolution against the camera's image")
             
             # 선택된 비교 모드에 따라 메트릭 계산
             rc_metrics = context.scene.rc_metrics
             compare_mode = rc_metrics.compare_mode
             
+            # Grayscale original is cached alongside the RGB one; the absolute
+            # difference is computed once and shared by the metrics and the diff image
+            diff_rgb = compute_abs_diff(render_array, original_img)
+            original_gray = None
+            if compare_mode == 'EDGES_ONLY' or rc_metrics.ssim_mode not in ('COLOR', 'WEIGHTED'):
+                original_gray = load_original_gray(original_path, render_array.shape[:2])
+            
             if compare_mode == 'STANDARD':
-                psnr_value, ssim_value = self.calculate_metrics_standard(render_array, original_img)
+                psnr_value, ssim_value = self.calculate_metrics_standard(
+                    render_array, original_img, original_gray, diff_rgb)
             elif compare_mode == 'NO_TRANSPARENT':
-                psnr_value, ssim_value = self.calculate_metrics_no_transparent(render_array, original_img, context)
+                psnr_value, ssim_value = self.calculate_metrics_no_transparent(
+                    render_array, original_img, context, original_gray, diff_rgb)
             elif compare_mode == 'EDGES_ONLY':
                 psnr_value, ssim_value = self.calculate_metrics_edges_only(
-                    render_array, original_img, rc_metrics.edge_thickness)
+                    render_array, original_img, rc_metrics.edge_thickness, rc_metrics.ssim_fast_mode,
+                    original_gray)
             
             # 결과가 유효하면 저장 및 디스플레이
             if psnr_value is not None and ssim_value is not None:
@@ -774,7 +1324,7 @@ class RCMETRICS_OT_Compare(bpy.types.Operator):
                 context.scene.rc_metrics.last_ssim = ssim_value
                 
                 # 차이 이미지 생성
-                diff_img = self.create_diff_image(render_array, original_img, context)
+                diff_img = self.create_diff_image(render_array, original_img, context, diff_rgb)
                 
                 # 차이 이미지 표시
                 if diff_img:
@@ -787,7 +1337,6 @@ class RCMETRICS_OT_Compare(bpy.types.Operator):
                 return {'CANCELLED'}
                 
         except Exception as e:
-            import traceback
             self.report({'ERROR'}, f"Unexpected error: {str(e)}")
             traceback.print_exc()
             return {'CANCELLED'}
@@ -904,6 +1453,9 @@ class RCMETRICS_OT_RenderCompare(bpy.types.Operator):
     bl_label = "Render and Compare"
     bl_options = {'REGISTER', 'UNDO'}
     
+    _timer = None
+    _steps = None
+    
     def execute(self, context):
         # First call the render operator
         bpy.ops.rcmetrics.render()
@@ -912,6 +1464,47 @@ class RCMETRICS_OT_RenderCompare(bpy.types.Operator):
         bpy.ops.rcmetrics.compare()
         
         return {'FINISHED'}
+    
+    def invoke(self, context, event):
+        # Run render and compare as separate timer steps so the UI redraws (and
+        # shows progress) in between instead of freezing for the whole job
+        self._steps = ['render', 'compare']
+        wm = context.window_manager
+        self._timer = wm.event_timer_add(0.1, window=context.window)
+        wm.modal_handler_add(self)
+        context.workspace.status_text_set("RC Metrics: rendering... (Esc to cancel)")
+        return {'RUNNING_MODAL'}
+    
+    def modal(self, context, event):
+        if event.type == 'ESC':
+            self.finish(context)
+            self.report({'WARNING'}, "Render and compare cancelled")
+            return {'CANCELLED'}
+        
+        if event.type != 'TIMER':
+            return {'PASS_THROUGH'}
+        
+        step = self._steps.pop(0)
+        if step == 'render':
+            result = bpy.ops.rcmetrics.render()
+            context.workspace.status_text_set("RC Metrics: comparing... (Esc to cancel)")
+        else:
+            result = bpy.ops.rcmetrics.compare()
+        
+        if 'FINISHED' not in result:
+            self.finish(context)
+            return {'CANCELLED'}
+        
+        if not self._steps:
+            self.finish(context)
+            return {'FINISHED'}
+        
+        return {'RUNNING_MODAL'}
+    
+    def finish(self, context):
+        context.window_manager.event_timer_remove(self._timer)
+        self._timer = None
+        context.workspace.status_text_set(None)
 
 class RCMETRICS_OT_WholeCameraAnalysis(bpy.types.Operator):
     """Analyze all cameras: render, measure, and save results"""
@@ -920,66 +1513,134 @@ class RCMETRICS_OT_WholeCameraAnalysis(bpy.types.Operator):
     bl_options = {'REGISTER', 'UNDO'}
 
     def execute(self, context):
-        import os
-        import time
-        import cv2
-        import numpy as np
+        if not HAS_DEPENDENCIES:
+            self.report({'ERROR'}, DEPENDENCY_ERROR)
+            return {'CANCELLED'}
+        
         scene = context.scene
         rc_metrics = scene.rc_metrics
         output_dir = rc_metrics.whole_camera_output_dir
         if not output_dir or not os.path.isdir(bpy.path.abspath(output_dir)):
             self.report({'ERROR'}, "Please select a valid output directory.")
             return {'CANCELLED'}
-        cameras = [obj for obj in scene.objects if obj.type == 'CAMERA']
+        # Name order matches the order the original images sit on disk
+        cameras = sorted((obj for obj in scene.objects if obj.type == 'CAMERA'), key=lambda obj: obj.name)
         if not cameras:
             self.report({'ERROR'}, "No cameras found in the scene.")
             return {'CANCELLED'}
-        results = []
+        
+        # Lets the camera/mesh enum callbacks reuse their cached items during the run
+        rc_metrics.is_calculating = True
+        try:
+            return self.analyze_cameras(context, cameras, output_dir)
+        finally:
+            rc_metrics.is_calculating = False
+    
+    def prefetch_original(self, pool, cam, render_shape):
+        """Start loading the camera's background image into the original-image cache"""
+        for bg in getattr(cam.data, 'background_images', ()):
+            if bg.image:
+                return pool.submit(load_original_image, bpy.path.abspath(bg.image.filepath), render_shape)
+        return None
+
+    def compare_camera(self, context, cam, output_dir, idx, total):
+        """Save the current render for cam and run the comparison on it (False if it failed)"""
+        rc_metrics = context.scene.rc_metrics
+        render_img = bpy.data.images.get("RC_Current_Render")
+        if not render_img or (render_img.source != 'GENERATED' and not render_img.filepath):
+            self.report({'WARNING'}, f"No render for {cam.name}")
+            return False
+        # Save rendered image to output dir
+        save_path = os.path.join(bpy.path.abspath(output_dir), f"{cam.name}.png")
+        try:
+            if render_img.source == 'GENERATED':
+                # In-memory render: this is the only place it is written to disk
+                cv2.imwrite(save_path, cv2.cvtColor(get_render_pixels(render_img), cv2.COLOR_RGBA2BGRA))
+            else:
+                shutil.copy(bpy.path.abspath(render_img.filepath), save_path)
+        except Exception as e:
+            self.report({'WARNING'}, f"Failed to save render for {cam.name}: {e}")
+        # Run comparison
+        rc_metrics.whole_camera_progress = f"Comparing {cam.name} ({idx+1}/{total})..."
+        if 'FINISHED' not in bpy.ops.rcmetrics.compare():
+            # last_psnr/last_ssim still hold the previous camera's values
+            self.report({'WARNING'}, f"Comparison failed for {cam.name}, skipping")
+            return False
+        return True
+
+    def analyze_cameras(self, context, cameras, output_dir):
+        """Render and compare every camera, then write the CSV/Excel results"""
+        scene = context.scene
+        rc_metrics = scene.rc_metrics
+        names = []
+        psnr_values = []
+        ssim_values = []
         total = len(cameras)
-        for idx, cam in enumerate(cameras):
-            scene.camera = cam
-            rc_metrics.whole_camera_progress = f"Rendering {cam.name} ({idx+1}/{total})..."
-            bpy.ops.rcmetrics.render()
-            render_img = bpy.data.images.get("RC_Current_Render")
-            if not render_img or not render_img.filepath:
-                self.report({'WARNING'}, f"No render for {cam.name}")
-                continue
-            render_path = bpy.path.abspath(render_img.filepath)
-            # Save rendered image to output dir
-            ext = os.path.splitext(render_path)[-1]
-            save_name = f"{cam.name}{ext}"
-            save_path = os.path.join(bpy.path.abspath(output_dir), save_name)
-            try:
-                import shutil
-                shutil.copy(render_path, save_path)
-            except Exception as e:
-                self.report({'WARNING'}, f"Failed to save render for {cam.name}: {e}")
-            # Run comparison
-            rc_metrics.whole_camera_progress = f"Comparing {cam.name} ({idx+1}/{total})..."
-            bpy.ops.rcmetrics.compare()
-            # Save metrics
-            results.append({
-                'Camera': cam.name,
-                'PSNR': rc_metrics.last_psnr,
-                'SSIM': rc_metrics.last_ssim
-            })
+        render = scene.render
+        scale = render.resolution_percentage / 100.0
+        render_shape = evaluation_shape((int(render.resolution_y * scale), int(render.resolution_x * scale)),
+                                        rc_metrics.eval_max_dim)
+        # Decode the next camera's background on an I/O thread while the current
+        # one renders; the compare step then finds it in the original-image cache.
+        # Only one load is in flight and it is joined before compare, so the
+        # cache is never touched from two threads at once.
+        prefetch_pool = ThreadPoolExecutor(max_workers=1)
+        prefetch = self.prefetch_original(prefetch_pool, cameras[0], render_shape) if cameras else None
+        # Only the camera changes between renders: keep the render data (BVH, images)
+        # alive across them and lock the UI so it does not redraw in between
+        original_persistent_data = render.use_persistent_data
+        original_lock_interface = render.use_lock_interface
+        render.use_persistent_data = True
+        render.use_lock_interface = True
+        try:
+            for idx, cam in enumerate(cameras):
+                scene.camera = cam
+                rc_metrics.whole_camera_progress = f"Rendering {cam.name} ({idx+1}/{total})..."
+                rendered = 'FINISHED' in bpy.ops.rcmetrics.render()
+                if prefetch is not None:
+                    prefetch.result()
+                    prefetch = None
+                if not rendered:
+                    # RC_Current_Render still holds the previous camera's image
+                    self.report({'WARNING'}, f"Render failed for {cam.name}, skipping")
+                elif self.compare_camera(context, cam, output_dir, idx, total):
+                    names.append(cam.name)
+                    psnr_values.append(rc_metrics.last_psnr)
+                    ssim_values.append(rc_metrics.last_ssim)
+                if idx + 1 < total:
+                    prefetch = self.prefetch_original(prefetch_pool, cameras[idx + 1], render_shape)
+        finally:
+            prefetch_pool.shutdown(wait=True)
+            render.use_persistent_data = original_persistent_data
+            render.use_lock_interface = original_lock_interface
+        
+        # Keep the results as flat arrays (one entry per analysed camera)
+        results = {
+            'Camera': names,
+            'PSNR': np.array(psnr_values, dtype=np.float64),
+            'SSIM': np.array(ssim_values, dtype=np.float64),
+        }
         # Save results to CSV/Excel
         csv_path = os.path.join(bpy.path.abspath(output_dir), "analysis_results.csv")
         with open(csv_path, 'w', newline='') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=['Camera', 'PSNR', 'SSIM'])
-            writer.writeheader()
-            for row in results:
-                writer.writerow(row)
+            writer = csv.writer(csvfile)
+            writer.writerow(['Camera', 'PSNR', 'SSIM'])
+            writer.writerows(zip(names, psnr_values, ssim_values))
         if HAS_PANDAS:
             try:
-                import pandas as pd
                 df = pd.DataFrame(results)
                 xlsx_path = os.path.join(bpy.path.abspath(output_dir), "analysis_results.xlsx")
                 df.to_excel(xlsx_path, index=False)
             except Exception as e:
                 self.report({'WARNING'}, f"Failed to save Excel: {e}")
         rc_metrics.whole_camera_progress = f"Analysis complete! Saved to {csv_path}"
-        self.report({'INFO'}, f"Whole Camera analysis complete. Results saved to {csv_path}")
+        summary = ""
+        if names:
+            # Summary statistics in one vectorized pass over the result arrays
+            psnr_arr, ssim_arr = results['PSNR'], results['SSIM']
+            summary = (f" PSNR mean {psnr_arr.mean():.2f}dB (min {psnr_arr.min():.2f}, max {psnr_arr.max():.2f}),"
+                       f" SSIM mean {ssim_arr.mean():.4f} (min {ssim_arr.min():.4f}, max {ssim_arr.max():.4f}).")
+        self.report({'INFO'}, f"Whole Camera analysis complete for {len(names)} cameras.{summary} Results saved to {csv_path}")
         return {'FINISHED'}
 
 # Registration
@@ -1000,3 +1661,8 @@ def unregister():
     bpy.utils.unregister_class(RCMETRICS_OT_Compare)
     bpy.utils.unregister_class(RCMETRICS_OT_Render)
     bpy.utils.unregister_class(RCMETRICS_OT_WholeCameraAnalysis)
+    
+    global _tile_executor
+    if _tile_executor is not None:
+        _tile_executor.shutdown(wait=False)
+        _tile_executor = None
@@ -3,20 +3,84 @@ Properties for the RC Metrics add-on.
 """
 
 import bpy
-from bpy.props import (StringProperty, PointerProperty, FloatProperty, EnumProperty, BoolProperty, IntProperty, FloatVectorProperty, CollectionProperty)
+from bpy.props import (StringProperty, PointerProperty, FloatProperty, EnumProperty, BoolProperty, IntProperty, FloatVectorProperty)
 from bpy.types import PropertyGroup
+from bpy.app.handlers import persistent
+
+# Enum item lists are rebuilt only after the scene changes. The version counter is
+# bumped by the depsgraph/load handlers registered below. Keeping the lists alive
+# also keeps their strings referenced, which Blender requires for dynamic enums.
+_enum_cache = {}
+_scene_version = 0
+
+# ID types whose updates can add, remove or rename enum entries
+_ENUM_ID_TYPES = ('OBJECT', 'COLLECTION', 'SCENE')
+
+@persistent
+def _bump_scene_version(*args):
+    """Invalidate the cached enum items"""
+    global _scene_version
+    _scene_version += 1
+
+@persistent
+def _on_depsgraph_update(scene, depsgraph=None):
+    """Invalidate only for updates that can change the item lists"""
+    if depsgraph is None or any(depsgraph.id_type_updated(id_type) for id_type in _ENUM_ID_TYPES):
+        _bump_scene_version()
+
+def _cached_items(kind, context, build, extra_key=None):
+    """Return the cached item list for kind, rebuilding it if the scene changed"""
+    key = (context.scene.as_pointer(), _scene_version, extra_key)
+    cached = _enum_cache.get(kind)
+    if cached is not None and context.scene.rc_metrics.is_calculating:
+        # Batch analysis switches cameras constantly; the lists don't change meanwhile
+        return cached[1]
+    if cached is None or cached[0] != key:
+        cached = (key, build(context))
+        _enum_cache[kind] = cached
+    return cached[1]
+
+def _view_layer_key(context):
+    view_layer = context.view_layer
+    return view_layer.as_pointer() if view_layer is not None else None
+
+# Sentinel items for empty lists
+NO_CAMERA_ITEMS = (('None', 'No Cameras', 'No cameras in scene'),)
+NO_MESH_ITEMS = (('None', 'No Meshes', 'No meshes in scene'),)
+NO_COLLECTION_ITEMS = (('None', 'No Collections', 'No collections in scene'),)
+
+def _build_object_items(context):
+    """Camera and mesh items from a single pass over the active view layer's objects"""
+    view_layer = context.view_layer
+    objects = view_layer.objects if view_layer is not None else context.scene.objects
+    cameras = []
+    meshes = []
+    for obj in objects:
+        if obj.type == 'CAMERA':
+            cameras.append((obj.name, obj.name, "Use this camera"))
+        elif obj.type == 'MESH':
+            meshes.append((obj.name, obj.name, "Use this mesh"))
+    return {
+        'CAMERA': tuple(cameras) or NO_CAMERA_ITEMS,
+        'MESH': tuple(meshes) or NO_MESH_ITEMS,
+    }
+
+def _build_collection_items(context):
+    collections = tuple((coll.name, coll.name, "Use this collection") for coll in bpy.data.collections)
+    return collections or NO_COLLECTION_ITEMS
 
 def get_camera_items(self, context):
     """Get all camera objects for enum property"""
-    cameras = [(cam.name, cam.name, f"Use camera {cam.name}") for cam in context.scene.objects if cam.type == 'CAMERA']
-    # Add 'None' option
-    if not cameras:
-        cameras = [('None', 'No Cameras', 'No cameras in scene')]
-    return cameras
+    return _cached_items('OBJECTS', context, _build_object_items, _view_layer_key(context))['CAMERA']
 
 def update_active_camera(self, context):
     """Update the active camera when selection changes"""
     if self.selected_camera and self.selected_camera != 'None':
+        # Nothing to do if it is already the active camera
+        active = context.scene.camera
+        if active is not None and active.name == self.selected_camera:
+            return None
+        
         # Find the camera object
         camera = context.scene.objects.get(self.selected_camera)
         if camera and camera.type == 'CAMERA':
@@ -25,19 +89,43 @@ def update_active_camera(self, context):
 
 def get_mesh_items(self, context):
     """Get all mesh objects for enum property"""
-    meshes = [(mesh.name, mesh.name, f"Use mesh {mesh.name}") for mesh in context.scene.objects if mesh.type == 'MESH']
-    # Add 'None' option
-    if not meshes:
-        meshes = [('None', 'No Meshes', 'No meshes in scene')]
-    return meshes
+    return _cached_items('OBJECTS', context, _build_object_items, _view_layer_key(context))['MESH']
 
 def get_collection_items(self, context):
     """Get all collections for enum property"""
-    collections = [(coll.name, coll.name, f"Use collection {coll.name}") for coll in bpy.data.collections]
-    # Add 'None' option
-    if not collections:
-        collections = [('None', 'No Collections', 'No collections in scene')]
-    return collections
+    # bpy.data.collections is not scene data, so also rebuild when its size changes
+    return _cached_items('COLLECTION', context, _build_collection_items, len(bpy.data.collections))
+
+# Static enum items, built once at import
+SELECTION_TYPE_ITEMS = (
+    ('MESH', 'Single Mesh', 'Render a single mesh object'),
+    ('COLLECTION', 'Collection', 'Render all objects in a collection'),
+)
+
+DIFF_VIEW_MODE_ITEMS = (
+    ('HEATMAP', 'Heatmap', 'Display difference as a heatmap'),
+    ('GRAYSCALE', 'Grayscale', 'Display difference in grayscale'),
+    ('COLORIZED', 'Colorized', 'Display difference with color enhancement'),
+)
+
+COMPARE_MODE_ITEMS = (
+    ('STANDARD', 'Standard', 'Calculate metrics on the entire image'),
+    ('NO_TRANSPARENT', 'Exclude Transparent', 'Exclude transparent areas from calculation'),
+    ('EDGES_ONLY', 'Edges Only', 'Calculate metrics only on edge areas'),
+)
+
+SSIM_MODE_ITEMS = (
+    ('GRAY', 'Gray', 'Grayscale SSIM'),
+    ('COLOR', 'Color', 'Color SSIM (RGB 평균)'),
+    ('WEIGHTED', 'Weighted', 'Weighted SSIM (RGB 가중 평균)'),
+)
+
+SSIM_DOWNSAMPLE_ITEMS = (
+    ('1', 'Full', 'Compute SSIM at full resolution'),
+    ('2', '1/2', 'Compute SSIM at half resolution (4x fewer pixels)'),
+    ('4', '1/4', 'Compute SSIM at quarter resolution (16x fewer pixels)'),
+    ('FIT', 'Fit 1024', 'Downsample only images larger than 1024 px on the long edge, so SSIM cost stays fixed'),
+)
 
 class RCMetricsProperties(PropertyGroup):
     """Property group for RC Metrics add-on"""
@@ -74,10 +162,7 @@ class RCMetricsProperties(PropertyGroup):
     selection_type: EnumProperty(
         name="Selection Type",
         description="Choose to render a single mesh or a collection of meshes",
-        items=[
-            ('MESH', 'Single Mesh', 'Render a single mesh object'),
-            ('COLLECTION', 'Collection', 'Render all objects in a collection')
-        ],
+        items=SELECTION_TYPE_ITEMS,
         default='MESH'
     )
     
@@ -100,8 +185,6 @@ class RCMetricsProperties(PropertyGroup):
         name="Last SSIM",
         description="Structural Similarity Index from last comparison",
         default=0.0,
-        min=0.0,
-        max=1.0,
         precision=4
     )
     
@@ -109,11 +192,7 @@ class RCMetricsProperties(PropertyGroup):
     diff_view_mode: EnumProperty(
         name="Difference View Mode",
         description="How to display the difference image",
-        items=[
-            ('HEATMAP', 'Heatmap', 'Display difference as a heatmap'),
-            ('GRAYSCALE', 'Grayscale', 'Display difference in grayscale'),
-            ('COLORIZED', 'Colorized', 'Display difference with color enhancement')
-        ],
+        items=DIFF_VIEW_MODE_ITEMS,
         default='COLORIZED'
     )
     
@@ -129,11 +208,7 @@ class RCMetricsProperties(PropertyGroup):
     compare_mode: EnumProperty(
         name="Compare Mode",
         description="Mode for comparing rendered and original images",
-        items=[
-            ('STANDARD', 'Standard', 'Calculate metrics on the entire image'),
-            ('NO_TRANSPARENT', 'Exclude Transparent', 'Exclude transparent areas from calculation'),
-            ('EDGES_ONLY', 'Edges Only', 'Calculate metrics only on edge areas')
-        ],
+        items=COMPARE_MODE_ITEMS,
         default='NO_TRANSPARENT'
     )
     
@@ -150,14 +225,39 @@ class RCMetricsProperties(PropertyGroup):
     ssim_mode: EnumProperty(
         name="SSIM Mode",
         description="Choose SSIM calculation method",
-        items=[
-            ('GRAY', 'Gray', 'Grayscale SSIM'),
-            ('COLOR', 'Color', 'Color SSIM (RGB 평균)'),
-            ('WEIGHTED', 'Weighted', 'Weighted SSIM (RGB 가중 평균)')
-        ],
+        items=SSIM_MODE_ITEMS,
         default='GRAY'
     )
 
+    # Uniform-window SSIM (faster than the Gaussian-weighted default)
+    ssim_fast_mode: BoolProperty(
+        name="Fast SSIM",
+        description="Use a uniform 11x11 window instead of Gaussian weighting for SSIM. Faster, but differs from Gaussian SSIM by about 1%",
+        default=False
+    )
+
+    # Resolution reduction before SSIM (PSNR always uses the full resolution)
+    ssim_downsample: EnumProperty(
+        name="SSIM Resolution",
+        description="Downsample both images (box filter) before computing SSIM. PSNR is always computed at full resolution",
+        items=SSIM_DOWNSAMPLE_ITEMS,
+        default='1'
+    )
+
+    fast_cycles: BoolProperty(
+        name="Fast Cycles Render",
+        description="For metric renders with Cycles, use adaptive sampling (noise threshold 0.1) and the GPU when a compute device is enabled. The scene's own settings are restored afterwards",
+        default=False
+    )
+
+    eval_max_dim: IntProperty(
+        name="Max Evaluation Size",
+        description="Downscale the render and original so their longer side is at most this many pixels before computing any metric (0 = full resolution)",
+        default=0,
+        min=0,
+        soft_max=4096
+    )
+
     # SSIM channel weights (for weighted mode)
     ssim_weights: FloatVectorProperty(
         name="SSIM Weights",
@@ -170,6 +270,14 @@ class RCMetricsProperties(PropertyGroup):
         step=0.01
     )
 
+    # Set while Whole Camera Analysis runs (not shown in the UI)
+    is_calculating: BoolProperty(
+        name="Calculating",
+        description="Whole Camera Analysis is running",
+        default=False,
+        options={'HIDDEN', 'SKIP_SAVE'}
+    )
+
     # Whole Camera 분석 결과 저장 폴더
     whole_camera_output_dir: StringProperty(
         name="Whole Camera Output Dir",
@@ -178,19 +286,36 @@ class RCMetricsProperties(PropertyGroup):
         subtype='DIR_PATH'
     )
 
-    # Whole Camera 분석 결과 임시 저장(런타임용, UI에는 노출 안 함)
-    whole_camera_results: CollectionProperty(type=bpy.types.PropertyGroup)
-
 # Registration function
 def register():
-    bpy.utils.register_class(RCMetricsProperties)
+    # Re-running register (e.g. after a script reload) replaces the existing pointer
+    if hasattr(bpy.types.Scene, 'rc_metrics'):
+        del bpy.types.Scene.rc_metrics
+    
+    # The class stays registered across a repeated register() call
+    if not getattr(RCMetricsProperties, 'is_registered', False):
+        bpy.utils.register_class(RCMetricsProperties)
     
     # Register property group
     bpy.types.Scene.rc_metrics = PointerProperty(type=RCMetricsProperties)
+    
+    # Invalidate cached enum items when objects/collections change or a file is loaded
+    if _on_depsgraph_update not in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.append(_on_depsgraph_update)
+    if _bump_scene_version not in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.append(_bump_scene_version)
 
 # Unregistration function
 def unregister():
-    # Unregister property group
-    del bpy.types.Scene.rc_metrics
+    if _on_depsgraph_update in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(_on_depsgraph_update)
+    if _bump_scene_version in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(_bump_scene_version)
+    _enum_cache.clear()
+    
+    # Unregister property group (may already be gone after a partial registration)
+    if hasattr(bpy.types.Scene, 'rc_metrics'):
+        del bpy.types.Scene.rc_metrics
     
-    bpy.utils.unregister_class(RCMetricsProperties)
+    if getattr(RCMetricsProperties, 'is_registered', False):
+        bpy.utils.unregister_class(RCMetricsProperties)
@@ -107,6 +107,9 @@ class RCMETRICS_PT_Panel(Panel):
             else:
                 box.label(text="No collection selected", icon='ERROR')
             
+        if scene.render.engine == 'CYCLES':
+            box.prop(rc_metrics, "fast_cycles")
+        
         # Render button (분리된 기능)
         row = box.row()
         if scene.camera and valid_selection:
@@ -132,6 +135,9 @@ class RCMETRICS_PT_Panel(Panel):
         
         # SSIM mode selector
         compare_box.prop(rc_metrics, "ssim_mode")
+        compare_box.prop(rc_metrics, "ssim_fast_mode")
+        compare_box.prop(rc_metrics, "ssim_downsample")
+        compare_box.prop(rc_metrics, "eval_max_dim")
         
         # SSIM weights (only show if weighted mode)
         if rc_metrics.ssim_mode == 'WEIGHTED':